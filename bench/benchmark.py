@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+import ingestion
+from bench.donnees_synthetiques import ecrire, generer
+from graphiques import construire_figures
+from kpis import calculer_kpis, schema_kpis
+from rapports import generate_docx_metrics, generate_pdf_metrics
+from schemas import SCHEMAS_ROLES, appliquer_schema, colonnes_utiles
+
+# --- Benchmark du pipeline des dashboards ---
+# Génère des fichiers synthétiques aux schémas des quatre exports puis chronomètre
+# chaque étape : lecture, typage (dates, catégories), KPIs, graphiques, DOCX, PDF.
+# Le résultat est un JSON (une entrée par taille) à comparer d'un commit à l'autre.
+#
+#   python -m bench.benchmark --lignes 1000 100000 1000000 --format csv -o bench.json
+
+
+def commit_git():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def chronometrer(fonction, repetitions):
+    # Renvoie (dernier résultat, durées en secondes)
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        durees.append(time.perf_counter() - debut)
+    return resultat, durees
+
+
+def serialiser_figures(resultats):
+    # Figures de vues/graphiques.py, sérialisées comme pour l'envoi au navigateur
+    return [fig.to_json() for fig in construire_figures(resultats).values()]
+
+
+def pic_memoire(fonction):
+    # Pic d'allocations Python pendant un appel (mesuré à part : tracemalloc ralentit)
+    tracemalloc.start()
+    try:
+        fonction()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def resume(durees):
+    return {
+        "min": round(min(durees), 6),
+        "mediane": round(statistics.median(durees), 6),
+        "max": round(max(durees), 6),
+    }
+
+
+def mesurer(chemins, repetitions=3):
+    contenus = {}
+    for role, chemin in chemins.items():
+        with open(chemin, "rb") as f:
+            contenus[role] = (os.path.basename(chemin), f.read())
+
+    etapes = {}
+
+    # Lecture brute (sans cache, limitée aux colonnes lues par les KPIs) puis typage
+    bruts, dataframes = {}, {}
+    for role, (nom, content) in contenus.items():
+        colonnes = colonnes_utiles(schema_kpis(role))
+        bruts[role], durees = chronometrer(
+            lambda: ingestion.parse_bytes(nom, content, colonnes=colonnes), repetitions
+        )
+        etapes[f"lecture.{role}"] = resume(durees)
+    for role, df in bruts.items():
+        dataframes[role], durees = chronometrer(lambda: appliquer_schema(df, schema_kpis(role)), repetitions)
+        etapes[f"typage.{role}"] = resume(durees)
+
+    df_users, df_entreprises, df_mises, df_globale = (dataframes[role] for role in SCHEMAS_ROLES)
+
+    resultats, durees = chronometrer(
+        lambda: calculer_kpis(df_users, df_entreprises, df_mises, df_globale), repetitions
+    )
+    etapes["kpis"] = resume(durees)
+
+    figures, durees = chronometrer(lambda: serialiser_figures(resultats), repetitions)
+    etapes["graphiques"] = resume(durees)
+
+    _, durees = chronometrer(lambda: generate_docx_metrics(resultats), repetitions)
+    etapes["docx"] = resume(durees)
+    _, durees = chronometrer(lambda: generate_pdf_metrics(resultats), repetitions)
+    etapes["pdf"] = resume(durees)
+
+    return {
+        "lignes_par_fichier": {role: len(df) for role, df in dataframes.items()},
+        "octets_par_fichier": {role: len(content) for role, (_, content) in contenus.items()},
+        "octets_graphiques": sum(len(fig) for fig in figures),
+        "memoire_pic_rapports": {
+            "docx": pic_memoire(lambda: generate_docx_metrics(resultats)),
+            "pdf": pic_memoire(lambda: generate_pdf_metrics(resultats)),
+        },
+        "moteurs": {role: df.attrs.get("ingestion", {}).get("moteur") for role, df in bruts.items()},
+        "etapes": etapes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chronomètre le pipeline des dashboards sur des données synthétiques.")
+    parser.add_argument("--lignes", type=int, nargs="+", default=[1_000, 100_000],
+                        help="Lignes de l'historique, une mesure par valeur (1k à 10M)")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--donnees", help="Conserver les fichiers générés dans ce dossier")
+    parser.add_argument("-o", "--sortie", help="Fichier JSON de sortie (défaut : sortie standard)")
+    args = parser.parse_args(argv)
+
+    rapport = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_git(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plateforme": platform.platform(),
+        "cpus": os.cpu_count(),
+        "format": args.format,
+        "repetitions": args.repetitions,
+        "mesures": [],
+    }
+
+    for lignes in args.lignes:
+        with tempfile.TemporaryDirectory() as dossier_temp:
+            dossier = os.path.join(args.donnees, str(lignes)) if args.donnees else dossier_temp
+            chemins = ecrire(generer(lignes, args.graine), dossier, args.format)
+            mesure = mesurer(chemins, args.repetitions)
+        mesure["lignes"] = lignes
+        rapport["mesures"].append(mesure)
+        total = sum(etape["mediane"] for etape in mesure["etapes"].values())
+        print(f"{lignes} lignes : {total:.3f} s (médianes cumulées)", file=sys.stderr)
+
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
+
+
+if __name__ == "__main__":
+    main()
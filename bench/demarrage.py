@@ -0,0 +1,151 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# --- Démarrage à froid et premier rendu des dashboards ---
+# Chaque cible est exécutée dans un processus neuf avec streamlit.testing :
+#   - demarrage_s : première exécution sans fichier (imports du script et de ses
+#     modules, rendu de la page vide) ;
+#   - premier_rendu_s : exécution suivante avec les quatre fichiers synthétiques
+#     (lecture, KPIs, rendu de la page).
+# modules_lourds liste les dépendances lourdes chargées après chaque étape.
+# Une cible est un script (app3.py) ou une page du dashboard multipage
+# (dashboard.py:vues/graphiques.py). Le processus mesuré n'importe que
+# streamlit.testing : pandas, générateur et benchmark restent dans le parent.
+#
+#   python -m bench.demarrage --lignes 10000 -o demarrage.json
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CIBLES = [
+    "app.py", "app2.py", "app3.py", "app4.py", "app5.py", "app6.py",
+    "dashboard.py:vues/synthese.py", "dashboard.py:vues/graphiques.py",
+    "dashboard.py:vues/explorateur.py", "dashboard.py:vues/extracts.py",
+]
+# plotly (sans express) est déjà importé par streamlit lui-même
+MODULES_LOURDS = ["plotly.express", "docx", "fpdf", "st_aggrid", "openpyxl", "pyarrow"]
+
+
+class _FichierUploade(io.BytesIO):
+    # Même interface que l'UploadedFile de Streamlit pour les lecteurs
+    def __init__(self, name, content):
+        super().__init__(content)
+        self.name, self.size = name, len(content)
+
+
+def _modules_lourds():
+    return [nom for nom in MODULES_LOURDS if nom in sys.modules]
+
+
+def _mesurer_cible(cible, dossier, timeout):
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.testing.v1 import AppTest
+
+    # Uploaders simulés : vides à la première exécution, remplis ensuite
+    # (chaque fichier porte le libellé de son uploader, voir NOMS_FICHIERS)
+    fichiers = {}
+    for nom in os.listdir(dossier):
+        with open(os.path.join(dossier, nom), "rb") as f:
+            fichiers[os.path.splitext(nom)[0]] = _FichierUploade(nom, f.read())
+    uploades = {}
+    DeltaGenerator.file_uploader = lambda self, label, *args, **kwargs: uploades.get(label)
+
+    script, _, page = cible.partition(":")
+    at = AppTest.from_file(os.path.join(RACINE, script), default_timeout=timeout)
+    if page:
+        at.switch_page(page)
+
+    debut = time.perf_counter()
+    at.run()
+    demarrage = time.perf_counter() - debut
+    modules_demarrage = _modules_lourds()
+
+    uploades.update(fichiers)
+    debut = time.perf_counter()
+    at.run()
+    premier_rendu = time.perf_counter() - debut
+
+    return {
+        "demarrage_s": round(demarrage, 4),
+        "premier_rendu_s": round(premier_rendu, 4),
+        "modules_lourds": {"demarrage": modules_demarrage, "premier_rendu": _modules_lourds()},
+        "exceptions": [e.value for e in at.exception],
+    }
+
+
+def mesurer(cible, dossier, timeout=120):
+    # Processus neuf par cible : aucun module ni cache hérité
+    processus = subprocess.run(
+        [sys.executable, "-m", "bench.demarrage", "--cible", cible, "--dossier", dossier],
+        capture_output=True, text=True, cwd=RACINE,
+        timeout=timeout,
+    )
+    if processus.returncode:
+        return {"erreur": processus.stderr.strip().splitlines()[-1:]}
+    return json.loads(processus.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure le démarrage à froid et le premier rendu des dashboards.")
+    parser.add_argument("cibles", nargs="*", default=CIBLES, help="Scripts ou script:page")
+    parser.add_argument("--lignes", type=int, default=10_000, help="Lignes de l'historique")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("-o", "--sortie", help="Fichier JSON de sortie (défaut : sortie standard)")
+    # Mode interne : une cible, dans le processus courant
+    parser.add_argument("--cible", help=argparse.SUPPRESS)
+    parser.add_argument("--dossier", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cible:
+        print(json.dumps(_mesurer_cible(args.cible, args.dossier, 120), ensure_ascii=False))
+        return
+
+    from bench.benchmark import commit_git
+    from bench.donnees_synthetiques import ecrire, generer
+
+    rapport = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit_git(),
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "cpus": os.cpu_count(),
+        "lignes": args.lignes,
+        "format": args.format,
+        "repetitions": args.repetitions,
+        "cibles": {},
+    }
+    with tempfile.TemporaryDirectory() as dossier:
+        ecrire(generer(args.lignes, args.graine), dossier, args.format)
+        for cible in args.cibles:
+            essais = [mesurer(cible, dossier) for _ in range(args.repetitions)]
+            reussis = [e for e in essais if "erreur" not in e]
+            if not reussis:
+                rapport["cibles"][cible] = essais[0]
+                print(f"{cible} : erreur {essais[0]['erreur']}", file=sys.stderr)
+                continue
+            # Minimum des essais : le moins perturbé par le reste de la machine
+            mesure = dict(reussis[-1])
+            for cle in ("demarrage_s", "premier_rendu_s"):
+                mesure[cle] = min(e[cle] for e in reussis)
+            rapport["cibles"][cible] = mesure
+            print(f"{cible} : démarrage {mesure['demarrage_s']:.3f} s, "
+                  f"premier rendu {mesure['premier_rendu_s']:.3f} s", file=sys.stderr)
+
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            f.write(texte + "\n")
+    else:
+        print(texte)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from schemas import cols_users, cols_entreprises, cols_mises, cols_globale
+
+# --- Générateur de jeux de données synthétiques ---
+# Produit les quatre fichiers (users, entreprises, mises en relation, base globale)
+# avec les colonnes attendues par les dashboards, en CSV ou XLSX.
+#
+#   python -m bench.donnees_synthetiques --lignes 100000 --format csv -o bench_data/
+
+# Taille de chaque fichier relativement à --lignes (l'historique est le plus gros)
+PROPORTIONS = {"users": 0.5, "entreprises": 0.1, "mises": 1.0, "globale": 0.25}
+
+# Limite de lignes d'une feuille Excel
+LIGNES_MAX_XLSX = 1_048_575
+
+PRENOMS = ["Camille", "Léa", "Hugo", "Louis", "Chloé", "Inès", "Jules", "Manon", "Nathan", "Zoé"]
+STATUTS_USERS = ["Actif", "Inactif", "En attente de validation"]
+STATUTS_ENTREPRISES = ["Publié", "Brouillon", "Archivé"]
+STATUTS_MISES = ["En attente", "Go between validé", "Go between refusé", "RDV réalisé", "RDV non réalisé"]
+CAR_SUM = ["CAR Hauts-de-France", "CAR Occitanie", "CAR Bretagne", "SUM Île-de-France", "SUM Auvergne-Rhône-Alpes"]
+STATUTS_INCUBATION = ["Incubation individuelle", "Incubation collective", "Alumni"]
+PROFILS = ["Complet", "Partiel", "Vide"]
+VILLES = ["Paris", "Lyon", "Lille", "Rennes", "Toulouse", "Marseille", "Nantes"]
+EFFECTIFS = ["1", "2-5", "6-10", "11-50", "50+"]
+
+
+def _dates(rng, n, debut="2021-01-01", fin="2025-12-31", format_date="%d/%m/%Y"):
+    debut, fin = pd.Timestamp(debut), pd.Timestamp(fin)
+    jours = rng.integers(0, (fin - debut).days + 1, n)
+    return (debut + pd.to_timedelta(jours, unit="D")).strftime(format_date)
+
+
+def _texte(prefixe, n):
+    return [f"{prefixe} {i}" for i in range(n)]
+
+
+def generer(lignes, graine=0):
+    rng = np.random.default_rng(graine)
+    n = {nom: max(1, int(lignes * part)) for nom, part in PROPORTIONS.items()}
+    noms = np.array(_texte("Entrepreneur", n["globale"]), dtype=object)
+    incubateurs = np.array([f"Incubateur {i}" for i in range(max(3, n["globale"] // 200))], dtype=object)
+
+    users = pd.DataFrame({
+        "#Id": np.arange(n["users"]),
+        "Prénom": rng.choice(PRENOMS, n["users"]),
+        "Nom": _texte("Nom", n["users"]),
+        "Inscrit depuis le": _dates(rng, n["users"], fin="2024-12-31"),
+        "Statut": rng.choice(STATUTS_USERS, n["users"], p=[0.7, 0.2, 0.1]),
+        "ID Unique": [f"U{i:08d}" for i in range(n["users"])],
+        "Date de dernière connexion": _dates(rng, n["users"], debut="2024-01-01", fin=pd.Timestamp.today()),
+    })
+
+    entreprises = pd.DataFrame({
+        "Id": np.arange(n["entreprises"]),
+        "Nom": _texte("Société", n["entreprises"]),
+        "Date de création": _dates(rng, n["entreprises"], debut="2015-01-01"),
+        "Date d'ouverture": _dates(rng, n["entreprises"]),
+        "Incubateurs": rng.choice(incubateurs, n["entreprises"]),
+        "À propos": "Une entreprise à impact accompagnée par le programme.",
+        "Missions": "Accompagner, financer, connecter.",
+        "Adresse": _texte("rue", n["entreprises"]),
+        "Ville": rng.choice(VILLES, n["entreprises"]),
+        "Code postal": rng.integers(10000, 95999, n["entreprises"]),
+        "Téléphone": "0102030405",
+        "Email": [f"contact{i}@exemple.fr" for i in range(n["entreprises"])],
+        "Effectifs": rng.choice(EFFECTIFS, n["entreprises"]),
+        "Linkedin": "https://www.linkedin.com/company/exemple",
+        "Site web": "https://exemple.fr",
+        "Équipe": "Fondatrice, CTO",
+        "Statut": rng.choice(STATUTS_ENTREPRISES, n["entreprises"], p=[0.6, 0.3, 0.1]),
+    })
+
+    go_valide = rng.random(n["mises"]) < 0.4
+    rdv = go_valide & (rng.random(n["mises"]) < 0.6)
+    mises = pd.DataFrame({
+        "Utilisateur": rng.choice(noms, n["mises"]),
+        "goBetween": rng.choice(["Partenaire A", "Partenaire B", "Partenaire C"], n["mises"]),
+        "Statut des mises en relation à date": rng.choice(STATUTS_MISES, n["mises"]),
+        "Dates simples": _dates(rng, n["mises"], format_date="%Y-%m"),
+        "Demande de mise en relation": "Oui",
+        "RDV réalisés": rdv.astype(int),
+        "Taux de conversion goBetween": np.round(rng.random(n["mises"]) * 100, 2),
+        "Taux de conversion RDV réalisé": np.round(rng.random(n["mises"]) * 100, 2),
+        "Go between validé": np.where(go_valide, "Oui", "Non"),
+        "Go between refusé": np.where(go_valide, "Non", "Oui"),
+        "Rdv non réalisé": (go_valide & ~rdv).astype(int),
+    })
+
+    globale = pd.DataFrame({
+        "Name": noms,
+        "Nom": _texte("Nom", n["globale"]),
+        "Projet": _texte("Projet", n["globale"]),
+        "CAR/SUM (territorial)": rng.choice(CAR_SUM, n["globale"]),
+        "Incubateur territorial": rng.choice(incubateurs, n["globale"]),
+        "Statut d'incubation": rng.choice(STATUTS_INCUBATION, n["globale"]),
+        "Poste et/ou fonction": rng.choice(["CEO", "CTO", "COO", "Fondateur·rice"], n["globale"]),
+        "Profil personnel Le Club": rng.choice(PROFILS, n["globale"]),
+        "Profil sociétés Le Club": rng.choice(PROFILS, n["globale"]),
+        "Partenaires Marketplace": rng.choice(["Oui", "Non"], n["globale"]),
+        "Date dernière connexion Le Club": _dates(rng, n["globale"], debut="2024-01-01"),
+    })
+
+    return {
+        "users": users[cols_users],
+        "entreprises": entreprises[cols_entreprises],
+        "mises": mises[cols_mises],
+        "globale": globale[cols_globale],
+    }
+
+
+NOMS_FICHIERS = {
+    "users": "Noms persos",
+    "entreprises": "Entreprises données",
+    "mises": "Historique des mises en relation",
+    "globale": "Base globale projet",
+}
+
+
+def ecrire(jeux, dossier, format_fichier="csv"):
+    os.makedirs(dossier, exist_ok=True)
+    chemins = {}
+    for role, df in jeux.items():
+        chemin = os.path.join(dossier, f"{NOMS_FICHIERS[role]}.{format_fichier}")
+        if format_fichier == "xlsx":
+            if len(df) > LIGNES_MAX_XLSX:
+                raise ValueError(f"{role} : {len(df)} lignes, au-delà de la limite d'une feuille Excel")
+            df.to_excel(chemin, index=False)
+        else:
+            df.to_csv(chemin, index=False)
+        chemins[role] = chemin
+    return chemins
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère des fichiers synthétiques aux schémas du dashboard.")
+    parser.add_argument("--lignes", type=int, default=10_000, help="Lignes de l'historique (1k à 10M)")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("-o", "--sortie", default="bench_data")
+    args = parser.parse_args(argv)
+
+    for role, chemin in ecrire(generer(args.lignes, args.graine), args.sortie, args.format).items():
+        print(f"{role} : {chemin}")
+
+
+if __name__ == "__main__":
+    main()
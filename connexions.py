@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from memo import Memo
+from mesures import mesure
+
+# --- Index trié des dates de dernière connexion ---
+# Trié une fois par version des données ; le nombre de profils actifs sur une
+# fenêtre quelconque (7/30/90 jours, plage libre, par territoire) est ensuite
+# une recherche dichotomique au lieu d'un parcours complet de la colonne.
+
+
+def _trier(dates):
+    valeurs = dates.dropna().to_numpy(dtype="datetime64[ns]")
+    return np.sort(valeurs)
+
+
+def _compter(dates, debut=None, fin=None):
+    # Profils connectés dans [debut, fin] (bornes incluses, None = ouvert)
+    gauche = 0 if debut is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(debut), "ns"), side="left")
+    droite = len(dates) if fin is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(fin), "ns"), side="right")
+    return int(max(droite - gauche, 0))
+
+
+@dataclass(frozen=True)
+class IndexConnexions:
+    dates: np.ndarray                               # datetime64[ns] triées, sans NaT
+    groupes: dict = field(default_factory=dict)     # {groupe: dates triées}
+    nom_groupe: str = None
+
+    @classmethod
+    @mesure("kpis.connexions")
+    def depuis(cls, df, colonne_date, colonne_groupe=None):
+        dates = df[colonne_date]
+        groupes = {}
+        if colonne_groupe and colonne_groupe in df.columns:
+            for groupe, dates_groupe in dates.groupby(df[colonne_groupe], observed=True, sort=True):
+                groupes[groupe] = _trier(dates_groupe)
+        return cls(_trier(dates), groupes, colonne_groupe)
+
+    def actifs(self, debut=None, fin=None):
+        return _compter(self.dates, debut, fin)
+
+    def actifs_sur(self, jours, today=None):
+        today = today or pd.Timestamp.today()
+        return self.actifs(debut=pd.Timestamp(today) - pd.Timedelta(days=jours))
+
+    def actifs_par_groupe(self, debut=None, fin=None):
+        serie = pd.Series(
+            {groupe: _compter(dates, debut, fin) for groupe, dates in self.groupes.items()},
+            dtype="int64", name="count",
+        )
+        serie.index.name = self.nom_groupe
+        return serie
+
+    def actifs_mensuels(self):
+        # Pour chaque mois : profils dont la dernière connexion tombe dans ce mois
+        # ou après, c'est-à-dire encore actifs depuis le début du mois
+        if not len(self.dates):
+            return pd.Series(dtype="int64", name="Profils actifs", index=pd.PeriodIndex([], freq="M", name="Mois"))
+        mois = self.dates.astype("datetime64[M]")
+        premier, dernier = mois[0], mois[-1]
+        codes = (mois - premier).astype("int64")
+        par_mois = np.bincount(codes, minlength=int((dernier - premier).astype("int64")) + 1)
+        index = pd.period_range(pd.Timestamp(premier), periods=len(par_mois), freq="M", name="Mois")
+        return pd.Series(par_mois[::-1].cumsum()[::-1], index=index, name="Profils actifs")
+
+
+# --- Mémoïsation sur l'empreinte des données ---
+CONNEXIONS_TAILLE = 8
+_connexions = Memo("connexions", CONNEXIONS_TAILLE)
+
+
+def connexions_memoise(df, version, colonne_date, colonne_groupe=None):
+    cle = (version, colonne_date, colonne_groupe)
+    return _connexions.obtenir(cle, lambda: IndexConnexions.depuis(df, colonne_date, colonne_groupe))
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+from memo import Memo
+from mesures import mesure
+
+# --- Cube de la base globale ---
+# Un comptage par combinaison des dimensions ci-dessous, calculé une seule fois par
+# version des données. Répartitions, pourcentages et drill-downs de la section
+# "Complétion des profils" sont ensuite des sommes de cellules du cube, sans
+# reparcourir df_globale.
+DIMENSIONS_GLOBALE = [
+    "CAR/SUM (territorial)",
+    "Incubateur territorial",
+    "Statut d'incubation",
+    "Profil personnel Le Club",
+    "Profil sociétés Le Club",
+]
+
+
+@dataclass(frozen=True)
+class CubeGlobale:
+    # Série des comptages, indexée par les dimensions (valeurs manquantes incluses)
+    cellules: pd.Series
+
+    @classmethod
+    @mesure("kpis.cube")
+    def depuis(cls, df_globale, dimensions=None):
+        dimensions = [col for col in (dimensions or DIMENSIONS_GLOBALE) if col in df_globale.columns]
+        cellules = df_globale.groupby(dimensions, observed=True, dropna=False, sort=True).size()
+        return cls(cellules[cellules > 0])
+
+    @property
+    def dimensions(self):
+        return list(self.cellules.index.names)
+
+    def filtrer(self, **filtres):
+        # filtres : {dimension: valeur ou liste de valeurs}, noms avec espaces via **{...}
+        cellules = self.cellules
+        for dimension, valeurs in filtres.items():
+            niveau = cellules.index.get_level_values(dimension)
+            if isinstance(valeurs, (list, tuple, set)):
+                cellules = cellules[niveau.isin(list(valeurs))]
+            else:
+                cellules = cellules[niveau == valeurs]
+        return CubeGlobale(cellules)
+
+    def total(self):
+        return int(self.cellules.sum())
+
+    def compter(self, dimension, par=None, normalize=False):
+        # Équivalent de compter_valeurs(df[dimension]) ou, avec par, de
+        # compter_valeurs(df.groupby(par)[dimension]) ; à comptage égal, les
+        # valeurs suivent l'ordre des catégories
+        niveaux = [par, dimension] if par else [dimension]
+        cellules = self.cellules
+        for niveau in niveaux:
+            cellules = cellules[cellules.index.get_level_values(niveau).notna()]
+        counts = cellules.groupby(level=niveaux, observed=True, sort=True).sum()
+
+        if par:
+            counts = _trier_par_groupe(counts, par)
+        else:
+            counts = counts.sort_values(ascending=False, kind="stable")
+
+        if normalize:
+            totaux = counts.groupby(level=par, observed=True).transform("sum") if par else counts.sum()
+            counts = counts / totaux
+        counts.name = "proportion" if normalize else "count"
+        return counts
+
+
+def _trier_par_groupe(counts, par):
+    # Tri décroissant à l'intérieur de chaque groupe, groupes dans l'ordre de l'index
+    morceaux = [groupe.sort_values(ascending=False, kind="stable")
+                for _, groupe in counts.groupby(level=par, observed=True, sort=False)]
+    return pd.concat(morceaux) if morceaux else counts
+
+
+# --- Mémoïsation sur l'empreinte de la base globale ---
+CUBE_TAILLE = 8
+_cubes = Memo("cube", CUBE_TAILLE)
+
+
+def cube_memoise(df_globale, version):
+    return _cubes.obtenir(version, lambda: CubeGlobale.depuis(df_globale))
@@ -0,0 +1,24 @@
+import streamlit as st
+
+from socle import executer
+
+# --- Dashboard multipage ---
+# Point d'entrée unique : l'upload et la lecture des fichiers sont communs
+# (socle.py) et chaque vue est un script de vues/, exécuté seulement quand sa
+# page est ouverte. Plotly Express, python-docx/fpdf2 et st_aggrid ne sont donc
+# chargés qu'à la première ouverture des vues qui s'en servent.
+# Avec LECLUB_DOSSIER, les fichiers viennent d'un dossier surveillé (dossier.py)
+# plutôt que des uploads.
+#
+#   streamlit run dashboard.py
+#   LECLUB_DOSSIER=/partage/exports streamlit run dashboard.py
+explorateur = st.Page("vues/explorateur.py", title="Explorateur")
+page = st.navigation([
+    st.Page("vues/synthese.py", title="Synthèse", default=True),
+    st.Page("vues/graphiques.py", title="Graphiques"),
+    explorateur,
+    st.Page("vues/extracts.py", title="Extracts"),
+])
+
+st.title("Dashboard Marketplace & Incubateur")
+executer(page.run, explorateur=page.url_path == explorateur.url_path)
@@ -0,0 +1,132 @@
+import fnmatch
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field, replace
+
+# --- Rôle d'un fichier d'après son nom ---
+# Motifs (insensibles à la casse) partagés par les lots de generer_rapports.py
+# et le dossier surveillé des dashboards
+MOTIFS_ROLES = {
+    "users": ["*noms*persos*", "*users*", "*utilisateurs*"],
+    "entreprises": ["*entreprises*"],
+    "mises": ["*mises*relation*", "*historique*"],
+    "globale": ["*base*globale*", "*globale*"],
+}
+
+EXTENSIONS = (".csv", ".xlsx")
+
+
+def role_fichier(nom):
+    nom = nom.lower()
+    if not nom.endswith(EXTENSIONS):
+        return None
+    for role, motifs in MOTIFS_ROLES.items():
+        if any(fnmatch.fnmatch(nom, motif) for motif in motifs):
+            return role
+    return None
+
+
+def fichiers_du_lot(dossier):
+    fichiers = {}
+    for nom in sorted(os.listdir(dossier)):
+        role = role_fichier(nom)
+        if role and role not in fichiers:
+            fichiers[role] = os.path.join(dossier, nom)
+    return fichiers
+
+
+# --- Dossier de données surveillé ---
+# Alternative aux uploads : les exports déposés chaque nuit dans un dossier
+# partagé (LECLUB_DOSSIER) sont rattachés à leur rôle par motif ; pour chaque
+# rôle, le fichier le plus récent est retenu. Chaque passage ne coûte qu'un
+# stat par fichier : un fichier n'est relu et haché que si son mtime ou sa
+# taille a changé, et seul un contenu différent donne une nouvelle version.
+# Les versions sont partagées par toutes les sessions du processus ; un fichier
+# inchangé garde son objet, donc son entrée du cache d'ingestion.
+DOSSIER = os.environ.get("LECLUB_DOSSIER")
+# Intervalle (secondes) de vérification du dossier par les dashboards ouverts
+INTERVALLE = float(os.environ.get("LECLUB_DOSSIER_INTERVALLE", "30"))
+
+_versions = {}
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FichierLocal:
+    # Même interface que l'UploadedFile de Streamlit (name, size, getvalue) :
+    # utilisable tel quel par ingestion.lire_fichiers_safe
+    name: str
+    chemin: str
+    mtime_ns: int
+    empreinte: str                      # sha256 du contenu
+    contenu: bytes = field(repr=False)
+
+    @property
+    def size(self):
+        return len(self.contenu)
+
+    def getvalue(self):
+        return self.contenu
+
+
+def _version(chemin, stat):
+    with _lock:
+        connu = _versions.get(chemin)
+    if connu is not None and (connu.mtime_ns, connu.size) == (stat.st_mtime_ns, stat.st_size):
+        return connu
+
+    with open(chemin, "rb") as f:
+        contenu = f.read()
+    # Fichier en cours d'écriture (copie nocturne) : on garde la version
+    # précédente, la suivante sera lue au prochain passage
+    apres = os.stat(chemin)
+    if (apres.st_mtime_ns, apres.st_size) != (stat.st_mtime_ns, len(contenu)):
+        return connu
+
+    empreinte = hashlib.sha256(contenu).hexdigest()
+    if connu is not None and connu.empreinte == empreinte:
+        # Réécrit à l'identique : même version, seul le mtime est retenu
+        fichier = replace(connu, mtime_ns=stat.st_mtime_ns)
+    else:
+        fichier = FichierLocal(os.path.basename(chemin), chemin, stat.st_mtime_ns, empreinte, contenu)
+    with _lock:
+        _versions[chemin] = fichier
+    return fichier
+
+
+def scanner(dossier=None):
+    # {role: FichierLocal} ; les rôles sans fichier lisible sont absents
+    dossier = dossier or DOSSIER
+    candidats = {}
+    for entree in os.scandir(dossier):
+        role = role_fichier(entree.name)
+        if role is None or not entree.is_file():
+            continue
+        mtime = entree.stat().st_mtime_ns
+        if role not in candidats or mtime > candidats[role][0]:
+            candidats[role] = (mtime, entree.path)
+
+    fichiers = {}
+    for role, (_, chemin) in candidats.items():
+        try:
+            fichier = _version(chemin, os.stat(chemin))
+        except OSError:
+            # Supprimé ou renommé entre le listage et la lecture
+            fichier = None
+        if fichier is not None:
+            fichiers[role] = fichier
+
+    # Les fichiers remplacés (export de la veille) ne sont plus gardés en mémoire
+    retenus = {chemin for _, chemin in candidats.values()}
+    racine = os.path.abspath(dossier)
+    with _lock:
+        for chemin in list(_versions):
+            if os.path.dirname(os.path.abspath(chemin)) == racine and chemin not in retenus:
+                del _versions[chemin]
+    return fichiers
+
+
+def versions(fichiers):
+    # Identifiant des contenus courants, pour détecter un changement
+    return tuple(sorted((role, fichier.empreinte) for role, fichier in fichiers.items()))
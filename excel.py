@@ -0,0 +1,202 @@
+import hashlib
+import io
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+
+from memo import Memo
+
+try:
+    # API interne d'openpyxl (lecture élaguée) : absente, repli sur iter_rows
+    from openpyxl.worksheet._reader import WorkSheetParser
+    from openpyxl.xml.constants import SHEET_MAIN_NS
+except ImportError:
+    WorkSheetParser, SHEET_MAIN_NS = None, ""
+
+# --- Lecture XLSX élaguée ---
+# Classeur ouvert en read_only : la feuille est parcourue ligne à ligne sans
+# construire d'objets Cell, et seules les cellules des colonnes demandées sont
+# décodées (nombres, dates, textes). Les autres sont sautées dès leur coordonnée,
+# ce qui évite le gros du coût des colonnes de texte libre.
+# Le parseur dérive de WorkSheetParser et lit des attributs internes d'openpyxl
+# (_get_source, _shared_strings, _date_formats) : si une version d'openpyxl ne les
+# a plus, la feuille est lue par l'API publique (iter_rows, toutes les cellules
+# décodées) puis filtrée sur les colonnes demandées. Mêmes résultats, plus lent.
+_CHIFFRES = "0123456789"
+_IGNOREE = object()  # cellule non vide d'une colonne non demandée
+_TEXTE = f"{{{SHEET_MAIN_NS}}}is"
+_T = f"{{{SHEET_MAIN_NS}}}t"
+_RUN = f"{{{SHEET_MAIN_NS}}}r"
+
+
+class _ParseurColonnes(WorkSheetParser or object):
+    # positions : indices (base 1) des colonnes à décoder, None = toutes
+    positions = None
+
+    def parse_cell(self, element):
+        if self.positions is None:
+            return super().parse_cell(element)
+        coordonnee = element.get("r")
+        if coordonnee:
+            self.col_counter = column_index_from_string(coordonnee.rstrip(_CHIFFRES))
+        else:
+            self.col_counter += 1
+        if self.col_counter not in self.positions:
+            valeur = _IGNOREE if len(element) else None
+            return {"row": self.row_counter, "column": self.col_counter, "value": valeur}
+        if element.get("t") == "inlineStr":
+            # Texte en ligne (exports pandas, outils tiers) : lu directement,
+            # sans passer par les objets RichText d'openpyxl
+            texte = element.find(_TEXTE)
+            morceaux = [] if texte is None else [texte.findtext(_T) or ""] + [
+                run.findtext(_T) or "" for run in texte.iterfind(_RUN)
+            ]
+            valeur = "".join(morceaux) if texte is not None else None
+            return {"row": self.row_counter, "column": self.col_counter, "value": valeur}
+        return super().parse_cell(element)
+
+
+# --- Noms des feuilles, mémorisés par SHA du contenu ---
+# La clé est l'empreinte et non le contenu : les classeurs eux-mêmes ne sont
+# pas retenus en mémoire.
+FEUILLES_TAILLE = 32
+_feuilles = Memo("excel.feuilles", FEUILLES_TAILLE)
+
+
+def _noms_feuilles(content):
+    classeur = load_workbook(io.BytesIO(content), read_only=True)
+    try:
+        return tuple(classeur.sheetnames)
+    finally:
+        classeur.close()
+
+
+def feuilles(content):
+    return _feuilles.obtenir(hashlib.sha256(content).hexdigest(), lambda: _noms_feuilles(content))
+
+
+def _nom_colonne(valeur, position):
+    # Même nommage que pd.read_excel pour les en-têtes vides
+    return f"Unnamed: {position}" if valeur is None else str(valeur).strip()
+
+
+def _parseur(classeur, onglet):
+    # Parseur élagué, ou None si l'API interne d'openpyxl n'est pas celle attendue
+    if WorkSheetParser is None:
+        return None
+    try:
+        options = {
+            "data_only": True,
+            "epoch": classeur.epoch,
+            "date_formats": classeur._date_formats,
+            "timedelta_formats": classeur._timedelta_formats,
+        }
+        chaines = onglet._shared_strings
+        source = onglet._get_source()
+    except AttributeError:
+        return None
+    try:
+        return _ParseurColonnes(source, chaines, **options)
+    except TypeError:
+        source.close()
+        return None
+
+
+def _lignes(classeur, onglet):
+    # (parseur, numéro, {colonne: valeur non vide}) pour chaque ligne présente dans
+    # le XML ; parseur vaut None en lecture de repli, qui décode toutes les cellules
+    parseur = _parseur(classeur, onglet)
+    if parseur is None:
+        for numero, ligne in enumerate(onglet.iter_rows(values_only=True), start=1):
+            yield None, numero, {c: v for c, v in enumerate(ligne, start=1) if v is not None}
+        return
+    try:
+        for numero, cellules in parseur.parse():
+            yield parseur, numero, {c["column"]: c["value"] for c in cellules if c["value"] is not None}
+    finally:
+        parseur.source.close()
+
+
+def lire(content, colonnes=None, feuille=None):
+    # Renvoie (df, infos). colonnes : noms à garder (None = toutes) ;
+    # feuille : nom de l'onglet (None = première feuille, comme pd.read_excel)
+    classeur = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        onglet = classeur[feuille] if feuille else classeur.worksheets[0]
+        lignes = _lignes(classeur, onglet)
+
+        entete, valeurs, nb_lignes = None, {}, 0
+        for parseur, numero, cellules in lignes:
+            if not cellules:
+                continue
+            if entete is None:
+                # Première ligne non vide : en-tête, puis on restreint le décodage
+                largeur = max(cellules)
+                entete = {c: _nom_colonne(cellules.get(c), c - 1) for c in range(1, largeur + 1)}
+                retenues = {c for c, nom in entete.items() if colonnes is not None and nom in colonnes}
+                # Sans projection, ou aucune colonne reconnue : tout est lu, comme pour un CSV
+                positions = retenues or set(entete)
+                if parseur is not None:
+                    parseur.positions = positions
+                valeurs = {c: [] for c in positions}
+                numero_entete = numero
+                continue
+            # Comme pd.read_excel, les lignes vides intermédiaires sont gardées
+            # (y compris celles absentes du XML) et celles de fin retirées
+            rang = numero - numero_entete - 1
+            for colonne, valeur in cellules.items():
+                serie = valeurs.get(colonne)
+                if serie is not None and valeur is not _IGNOREE:
+                    serie.extend([None] * (rang - len(serie)))
+                    serie.append(valeur)
+            nb_lignes = rang + 1
+    finally:
+        classeur.close()
+
+    entete = entete or {}
+    donnees = {
+        entete[c]: serie + [None] * (nb_lignes - len(serie))
+        for c, serie in sorted(valeurs.items())
+    }
+    # Nombres et dates typés par colonne ; contrairement à pd.read_excel, les
+    # cellules texte restent du texte ("0102030405" ne devient pas 102030405)
+    df = pd.DataFrame(donnees).infer_objects() if donnees else pd.DataFrame()
+    infos = {
+        "moteur": "openpyxl", "encodage": None, "separateur": None, "repli": False,
+        "feuille": onglet.title, "colonnes_ignorees": len(entete) - len(valeurs),
+    }
+    return df, infos
+
+
+def blocs(fichier, colonnes, taille_bloc):
+    # Lecture par blocs de la première feuille (streaming.py) : même en-tête et
+    # mêmes lignes que lire(), en DataFrames d'au plus taille_bloc lignes
+    classeur = load_workbook(fichier, read_only=True, data_only=True)
+    try:
+        entete, positions, tampon = None, [], []
+        for parseur, numero, cellules in _lignes(classeur, classeur.worksheets[0]):
+            if not cellules:
+                continue
+            if entete is None:
+                largeur = max(cellules)
+                entete = {c: _nom_colonne(cellules.get(c), c - 1) for c in range(1, largeur + 1)}
+                positions = [c for c, nom in entete.items() if nom in colonnes]
+                if parseur is not None:
+                    parseur.positions = set(positions)
+                noms = [entete[c] for c in positions]
+                precedent = numero
+                continue
+            # Lignes vides intermédiaires gardées, celles de fin retirées
+            tampon.extend([None] * len(positions) for _ in range(numero - precedent - 1))
+            tampon.append([cellules.get(c) for c in positions])
+            precedent = numero
+            while len(tampon) >= taille_bloc:
+                yield pd.DataFrame(tampon[:taille_bloc], columns=noms)
+                tampon = tampon[taille_bloc:]
+    finally:
+        classeur.close()
+    if entete is None:
+        noms = []
+    if tampon or not noms:
+        yield pd.DataFrame(tampon, columns=noms)
@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from memo import Memo
+
+# --- Génération des extracts à la demande ---
+# Un extract n'est généré que lorsqu'on le demande, dans un thread d'arrière-plan,
+# puis gardé en mémoire par empreinte des données : les téléchargements suivants
+# du même jeu de données sont immédiats, pour toutes les sessions.
+EXPORTS_TAILLE = 16
+INTERVALLE_SUIVI = 0.5
+
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="exports")
+_extracts = Memo("exports", EXPORTS_TAILLE)
+_jobs = {}
+_lock = threading.Lock()
+
+
+def extract_pret(cle):
+    return _extracts.get(cle)
+
+
+def _generer(cle, generateur, resultats):
+    data = generateur(resultats).getvalue()
+    _extracts.put(cle, data)
+    with _lock:
+        _jobs.pop(cle, None)
+    return data
+
+
+def lancer(cle, generateur, resultats):
+    # Renvoie (future, début) ; un job déjà en cours pour la même clé est réutilisé
+    with _lock:
+        job = _jobs.get(cle)
+        if job is None or job[0].done():
+            job = _jobs[cle] = (_pool.submit(_generer, cle, generateur, resultats), time.monotonic())
+    return job
+
+
+def job_courant(cle):
+    with _lock:
+        return _jobs.get(cle)
+
+
+def bouton_telechargement(cle, generateur, resultats, label, file_name, mime):
+    # cle : empreinte des données (kpis.cle_donnees) ; une clé par format/label
+    import streamlit as st
+
+    cle = (*cle, label)
+    data = extract_pret(cle)
+    if data is not None:
+        st.download_button(label=label, data=data, file_name=file_name, mime=mime, key=f"telecharger-{label}")
+        return
+
+    job = job_courant(cle)
+    if job is not None and job[0].done():
+        # Un job terminé sans extract en cache a échoué
+        st.error(f"Échec de la génération de l'extract : {job[0].exception()}")
+    if job is None or job[0].done():
+        # « Télécharger l'extract final en DOCX » -> « Générer l'extract final en DOCX »
+        if st.button(label.replace("Télécharger", "Générer", 1), key=f"preparer-{label}"):
+            lancer(cle, generateur, resultats)
+            st.rerun()
+        return
+
+    @st.fragment(run_every=INTERVALLE_SUIVI)
+    def suivi():
+        future, debut = job
+        if future.done():
+            # Relance complète du script : le bouton de téléchargement s'affiche
+            st.rerun()
+        st.info(f"Génération de l'extract en cours… ({time.monotonic() - debut:.0f} s)")
+
+    suivi()
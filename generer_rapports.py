@@ -0,0 +1,128 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import ingestion
+from dossier import fichiers_du_lot
+from kpis import calculer_kpis, schema_kpis
+from rapports import generate_docx_metrics, generate_pdf_metrics
+from schemas import SCHEMAS_ROLES, colonnes_utiles
+
+# --- Génération des extracts DOCX / PDF en ligne de commande ---
+# Sans navigateur ni runtime Streamlit. Un lot = les quatre fichiers d'un
+# incubateur ; avec --dossier, chaque sous-dossier est un lot et les lots sont
+# générés en parallèle dans un pool de processus.
+#
+#   python generer_rapports.py --users u.csv --entreprises e.xlsx --mises m.csv --globale g.xlsx -o sortie
+#   python generer_rapports.py --dossier exports/ -o sortie --workers 8 --format pdf
+
+GENERATEURS = {
+    "docx": generate_docx_metrics,
+    "pdf": generate_pdf_metrics,
+}
+
+
+def charger(chemin, schema):
+    with open(chemin, "rb") as f:
+        content = f.read()
+    df = ingestion.charger_dataframe(os.path.basename(chemin), content, schema=schema)
+    missing_cols = ingestion.colonnes_manquantes(df, colonnes_utiles(schema))
+    if missing_cols:
+        raise ingestion.IngestionError(f"Colonnes manquantes dans {os.path.basename(chemin)} : {missing_cols}")
+    return df
+
+
+def generer_lot(nom_lot, fichiers, sortie, streaming=False, format_sortie="docx", pivot=False):
+    # Exécuté dans un processus du pool : renvoie le chemin du fichier écrit
+    manquants = [role for role in SCHEMAS_ROLES if role not in fichiers]
+    if manquants:
+        raise ingestion.IngestionError(f"Fichiers introuvables pour {nom_lot} : {manquants}")
+
+    marketplace = None
+    if streaming:
+        # Historique agrégé par blocs, sans jamais être chargé en entier
+        from streaming import agreger_marketplace
+
+        marketplace = agreger_marketplace(fichiers["mises"])
+        df_mises = None
+    else:
+        df_mises = charger(fichiers["mises"], schema_kpis("mises"))
+
+    resultats = calculer_kpis(
+        charger(fichiers["users"], schema_kpis("users")),
+        charger(fichiers["entreprises"], schema_kpis("entreprises")),
+        df_mises,
+        charger(fichiers["globale"], schema_kpis("globale")),
+        marketplace=marketplace,
+    )
+    # Le PDF présente toujours ces répartitions en tableau croisé
+    options = {"pivot": True} if pivot and format_sortie == "docx" else {}
+    data = GENERATEURS[format_sortie](resultats, **options)
+
+    chemin = os.path.join(
+        sortie, f"dashboard_extract_{nom_lot}_{datetime.today().strftime('%Y%m%d')}.{format_sortie}"
+    )
+    with open(chemin, "wb") as f:
+        f.write(data.getvalue())
+    return chemin
+
+
+def lots_a_generer(args):
+    if args.dossier:
+        lots = {}
+        for nom in sorted(os.listdir(args.dossier)):
+            chemin = os.path.join(args.dossier, nom)
+            if os.path.isdir(chemin):
+                lots[nom] = fichiers_du_lot(chemin)
+        # Un dossier sans sous-dossier est traité comme un lot unique
+        if not lots:
+            lots[os.path.basename(os.path.normpath(args.dossier))] = fichiers_du_lot(args.dossier)
+        return lots
+    fichiers = {role: getattr(args, role) for role in SCHEMAS_ROLES if getattr(args, role)}
+    return {args.nom or "extract": fichiers}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère les extracts DOCX / PDF du dashboard Marketplace & Incubateur.")
+    parser.add_argument("--users", help="Fichier Noms persos (csv/xlsx)")
+    parser.add_argument("--entreprises", help="Fichier Entreprises données (csv/xlsx)")
+    parser.add_argument("--mises", help="Historique des mises en relation (csv/xlsx)")
+    parser.add_argument("--globale", help="Base globale projet (csv/xlsx)")
+    parser.add_argument("--nom", help="Nom du lot pour le fichier de sortie (mode fichiers)")
+    parser.add_argument("--dossier", help="Dossier de lots : un sous-dossier par incubateur")
+    parser.add_argument("-o", "--sortie", default=".", help="Dossier de sortie des extracts")
+    parser.add_argument("--format", choices=list(GENERATEURS), default="docx", help="Format des extracts")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    parser.add_argument("--streaming", action="store_true", help="Agrège l'historique par blocs (fichiers volumineux)")
+    parser.add_argument("--pivot", action="store_true",
+                        help="DOCX : répartitions par CAR/SUM et par incubateur en tableau croisé")
+    args = parser.parse_args(argv)
+
+    if not args.dossier and not any(getattr(args, role) for role in SCHEMAS_ROLES):
+        parser.error("indiquer --dossier ou les quatre fichiers --users/--entreprises/--mises/--globale")
+
+    os.makedirs(args.sortie, exist_ok=True)
+    lots = lots_a_generer(args)
+
+    erreurs = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(generer_lot, nom_lot, fichiers, args.sortie, args.streaming, args.format, args.pivot): nom_lot
+            for nom_lot, fichiers in lots.items()
+        }
+        for future in as_completed(futures):
+            nom_lot = futures[future]
+            try:
+                print(f"{nom_lot} : {future.result()}")
+            except Exception as e:
+                erreurs += 1
+                print(f"{nom_lot} : ERREUR {e}", file=sys.stderr)
+
+    print(f"{len(lots) - erreurs}/{len(lots)} extract(s) généré(s)")
+    return 1 if erreurs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+
+import pandas as pd
+import plotly.express as px
+
+from kpis import cle_donnees, kpis_memoises
+from memo import Memo, taille_objet
+from mesures import etape, mesure
+
+# --- Figures Plotly du dashboard ---
+# Construites à partir des comptages de ResultatsKPI (quelques lignes par figure)
+# et non des lignes brutes : la taille du JSON envoyé au navigateur ne dépend plus
+# du volume des fichiers. Les figures sont mémorisées par version des données.
+
+
+MESURES_PERIODES = {
+    "demandes": "Demandes",
+    "go_between_valides": "Go Between validés",
+    "rdv_realises": "RDV réalisés",
+}
+
+
+def _barres(counts, x, y, title):
+    with etape("graphique", title):
+        df = counts.rename_axis(x).reset_index(name=y)
+        return px.bar(df, x=x, y=y, title=title, text=y)
+
+
+def _camembert(counts, title):
+    with etape("graphique", title):
+        df = counts.rename_axis("Statut").reset_index(name="Nombre")
+        return px.pie(df, names="Statut", values="Nombre", title=title)
+
+
+@mesure("graphiques")
+def construire_figures(resultats):
+    figures = {}
+
+    if not resultats.statuts_mises.empty:
+        figures["statut"] = _barres(
+            resultats.statuts_mises, "Statut des mises en relation à date", "Nombre",
+            "Répartition des statuts des mises en relation",
+        )
+    for granularite, rollup in resultats.rollups.items():
+        if rollup.empty:
+            continue
+        periode = rollup.index.name
+        with etape("graphique", f"Demandes par {periode.lower()}"):
+            df = rollup[list(MESURES_PERIODES)].rename(columns=MESURES_PERIODES)
+            df.index = df.index.astype(str)
+            figures[f"periodes_{granularite}"] = px.bar(
+                df.reset_index(), x=periode, y=list(MESURES_PERIODES.values()), barmode="group",
+                title=f"Demandes par {periode.lower()}", labels={"value": "Nombre", "variable": ""},
+            )
+
+    taux = pd.Series(
+        [resultats.taux_go_between, resultats.taux_rdv], index=["Go Between", "RDV réalisés"]
+    )
+    figures["taux"] = _barres(taux, "Indicateur", "Taux (%)", "Taux de conversion moyen")
+
+    figures["users_statut"] = _camembert(resultats.statut_users, "Répartition des statuts profils persos")
+    figures["entreprises_statut"] = _camembert(
+        resultats.statut_entreprises, "Répartition des statuts profils sociétés"
+    )
+
+    if not resultats.profil_personnel.empty:
+        figures["complet_persos"] = _barres(
+            resultats.profil_personnel, "Statut", "Nombre", "Complétion profils personnels"
+        )
+    if not resultats.profil_societes.empty:
+        figures["complet_societes"] = _barres(
+            resultats.profil_societes, "Statut", "Nombre", "Complétion profils sociétés"
+        )
+    return figures
+
+
+def afficher(figures, cle):
+    # st.plotly_chart sérialise la figure en JSON à chaque exécution du script :
+    # c'est cette sérialisation (et l'envoi) qui est mesurée ici
+    import streamlit as st
+
+    with etape("affichage", cle):
+        st.plotly_chart(figures[cle], use_container_width=True)
+
+
+# --- Mémoïsation sur l'empreinte des données ---
+FIGURES_TAILLE = 8
+# Seules les figures sont comptées : les résultats le sont déjà par le mémo de kpis.py
+_figures = Memo("graphiques", FIGURES_TAILLE, mesurer=lambda valeur: taille_objet(valeur[1]))
+
+
+def figures_memoisees(df_users, df_entreprises, df_mises, df_globale, marketplace=None):
+    # Renvoie (resultats, figures) ; les figures sont partagées entre les sessions,
+    # à ne pas modifier en place
+    cle = cle_donnees(df_users, df_entreprises, df_mises, df_globale)
+
+    def construire():
+        resultats = kpis_memoises(df_users, df_entreprises, df_mises, df_globale, marketplace=marketplace)
+        return resultats, construire_figures(resultats)
+    return _figures.obtenir(cle, construire)
@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+
+from cube import DIMENSIONS_GLOBALE
+
+# --- Grille paginée côté serveur ---
+# Les filtres sont des prédicats {colonne: valeurs retenues} saisis côté Streamlit ;
+# seule la page visible est envoyée à AgGrid. Les KPIs se recalculent à partir des
+# prédicats (cube de la base globale), sans faire transiter le tableau complet.
+TAILLE_PAGE = 100
+COLONNES_FILTRABLES = DIMENSIONS_GLOBALE
+
+
+def predicats_actifs(predicats):
+    # Une colonne sans valeur retenue ne filtre pas
+    return {col: list(valeurs) for col, valeurs in predicats.items() if valeurs}
+
+
+def masque(df, predicats):
+    retenu = np.ones(len(df), dtype=bool)
+    for col, valeurs in predicats_actifs(predicats).items():
+        retenu &= df[col].isin(valeurs).to_numpy()
+    return retenu
+
+
+def nb_pages(nb_lignes, taille_page=TAILLE_PAGE):
+    return max(1, math.ceil(nb_lignes / taille_page))
+
+
+def page(df, retenu, numero, taille_page=TAILLE_PAGE, tri=None, croissant=True):
+    # numero commence à 1 ; le tri porte sur toutes les lignes filtrées
+    positions = np.flatnonzero(retenu)
+    if tri:
+        valeurs = df[tri].iloc[positions].reset_index(drop=True)
+        ordre = valeurs.sort_values(ascending=croissant, kind="stable", na_position="last").index
+        positions = positions[ordre.to_numpy()]
+    debut = (numero - 1) * taille_page
+    return df.iloc[positions[debut:debut + taille_page]]
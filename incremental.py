@@ -0,0 +1,229 @@
+import base64
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import ingestion
+import snapshots
+from kpis import AgregatsMarketplace
+from memo import Memo
+from schemas import SCHEMA_MISES, appliquer_schema, colonnes_utiles
+
+# --- Ingestion incrémentale de l'historique des mises en relation ---
+# L'export ne fait que grossir : si le nouveau fichier commence exactement par les
+# octets du précédent, seules les lignes ajoutées sont parsées et combinées aux
+# agrégats Marketplace existants. Sinon (XLSX, fichier réécrit), recalcul complet.
+# Un état est propre à une lignée de contenu et à un schéma de lecture (clé :
+# nom, schéma, SHA du fichier) : deux équipes qui envoient un fichier de même
+# nom, ou deux pages qui ne lisent pas les mêmes colonnes, ont chacune le leur.
+# Un état ne garde que les agrégats et de quoi reconnaître le fichier : le
+# DataFrame complet est repris du cache d'ingestion (borné par son budget
+# mémoire) ou du snapshot ; s'il en a été évincé, le fichier est rechargé.
+
+
+@dataclass
+class EtatHistorique:
+    octets: int
+    sha: str
+    entete: bytes
+    version: str                    # empreinte du DataFrame (df.attrs["empreinte"])
+    agregats: AgregatsMarketplace
+    schema: str                     # empreinte du schéma de lecture (voir _version_schema)
+    cle: tuple = None               # clé du DataFrame dans ingestion.cache
+
+
+# {(nom, schéma, sha du contenu): EtatHistorique}, les moins récemment utilisés évincés
+ETATS_TAILLE = 32
+_etats = Memo("incremental", ETATS_TAILLE)
+
+
+def _sha(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def _cle_cache(name, content, schema, feuille=None):
+    return ingestion.cache_key(name, content, colonnes_utiles(schema), schema, feuille)
+
+
+def _version_schema(schema, feuille=None):
+    return ingestion.empreinte((tuple(colonnes_utiles(schema)), tuple(schema.items()), feuille))
+
+
+def _chemin_etat(name, schema):
+    # Un fichier d'état par nom et schéma de lecture
+    nom = hashlib.sha256(f"{name}\0{schema}".encode()).hexdigest()[:16]
+    return os.path.join(snapshots.SNAPSHOT_DIR, f"historique-{nom}.json")
+
+
+def _sauver_etat(name, etat, df, ecrire_snapshot):
+    # L'état est relu au redémarrage ; le DataFrame complet est repris du
+    # snapshot de la version correspondante. Au chargement complet, ce snapshot
+    # a déjà été écrit par ingestion.construire_dataframe.
+    if ecrire_snapshot or not snapshots.existe(etat.version):
+        snapshots.sauver(etat.version, df)
+    chemin = _chemin_etat(name, etat.schema)
+    with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({
+            "octets": etat.octets,
+            "sha": etat.sha,
+            "entete": base64.b64encode(etat.entete).decode("ascii"),
+            "version": etat.version,
+            "schema": etat.schema,
+            "agregats": etat.agregats.vers_dict(),
+        }, f)
+    os.replace(chemin + ".tmp", chemin)
+
+
+def _charger_etat(name, schema):
+    chemin = _chemin_etat(name, schema)
+    if not os.path.exists(chemin):
+        return None
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            valeurs = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        agregats = AgregatsMarketplace.depuis_dict(valeurs["agregats"])
+    except (KeyError, TypeError, ValueError):
+        # Format d'agrégats d'une version précédente : recalcul complet
+        return None
+    return EtatHistorique(
+        octets=valeurs["octets"],
+        sha=valeurs["sha"],
+        entete=base64.b64decode(valeurs["entete"]),
+        version=valeurs["version"],
+        agregats=agregats,
+        schema=valeurs.get("schema"),
+    )
+
+
+def concatener(df_precedent, df_delta):
+    # pd.concat repasse en object les catégorielles dont les catégories diffèrent
+    colonnes = {}
+    for col in df_precedent.columns:
+        avant, apres = df_precedent[col], df_delta[col]
+        if isinstance(avant.dtype, pd.CategoricalDtype) and isinstance(apres.dtype, pd.CategoricalDtype):
+            colonnes[col] = pd.Series(union_categoricals([avant, apres], ignore_order=True), name=col)
+        else:
+            colonnes[col] = pd.concat([avant, apres], ignore_index=True)
+    return pd.DataFrame(colonnes)
+
+
+def _delta(etat, name, content, schema):
+    # Renvoie les octets ajoutés depuis l'état, ou None si le fichier n'est pas
+    # une simple extension du précédent lu avec le même schéma
+    if etat is None or etat.agregats is None or not name.endswith(".csv") or len(content) < etat.octets:
+        return None
+    if etat.schema != schema:
+        return None
+    if not content[:etat.octets].endswith(b"\n"):
+        return None
+    if _sha(content[:etat.octets]) != etat.sha:
+        return None
+    return content[etat.octets:]
+
+
+def _etat_parent(name, content, schema):
+    # Renvoie (clé, état, delta) de l'état dont le fichier est le début de
+    # content, sinon (None, None, None). L'état enregistré sur disque n'est relu
+    # que si aucun état en mémoire ne convient.
+    candidats = [(cle, etat) for cle, etat in _etats.items() if cle[:2] == (name, schema)]
+    for cle, etat in candidats:
+        delta = _delta(etat, name, content, schema)
+        if delta is not None:
+            return cle, etat, delta
+    if snapshots.actif():
+        etat = _charger_etat(name, schema)
+        delta = _delta(etat, name, content, schema)
+        if delta is not None:
+            return None, etat, delta
+    return None, None, None
+
+
+def _dataframe(etat):
+    # DataFrame complet de l'état : cache d'ingestion, sinon snapshot, sinon None
+    df = ingestion.cache.get(etat.cle) if etat.cle else None
+    if df is None and snapshots.actif():
+        df = snapshots.charger(etat.version)
+    return df
+
+
+def charger_historique(name, content, schema=SCHEMA_MISES, feuille=None):
+    # Renvoie (df_mises, agregats, infos). Lève IngestionError.
+    # feuille : onglet d'un XLSX, toujours rechargé en entier.
+    version_schema = _version_schema(schema, feuille)
+    cle_parent, etat, delta = _etat_parent(name, content, version_schema)
+    cle = _cle_cache(name, content, schema, feuille)
+    version = ingestion.empreinte(cle)
+    df_parent = _dataframe(etat) if delta is not None else None
+    if df_parent is None:
+        delta = None
+
+    if delta is not None and not delta.strip():
+        infos = {"mode": "inchange", "lignes_ajoutees": 0}
+        df, agregats = df_parent, etat.agregats
+    elif delta is not None:
+        try:
+            df_delta = ingestion.parse_bytes(name, etat.entete + delta, colonnes=colonnes_utiles(schema))
+        except ingestion.IngestionError:
+            df_delta = None
+        if df_delta is None or list(df_delta.columns) != list(df_parent.columns):
+            delta = None
+        else:
+            df_delta = appliquer_schema(df_delta, schema)
+            df = concatener(df_parent, df_delta)
+            # Copie profonde : les agrégats de la version précédente peuvent
+            # encore servir à d'autres sessions
+            agregats = copy.deepcopy(etat.agregats).ajouter(df_delta)
+            infos = {"mode": "delta", "lignes_ajoutees": len(df_delta)}
+
+    if delta is None:
+        df = ingestion.charger_dataframe(name, content, schema=schema, feuille=feuille)
+        # Colonnes manquantes : pas d'agrégats, l'erreur est signalée par l'appelant
+        agregats = None if ingestion.colonnes_manquantes(df, colonnes_utiles(schema)) else AgregatsMarketplace.depuis(df)
+        infos = {"mode": "complet", "lignes_ajoutees": len(df)}
+
+    # Copie légère : les attrs du DataFrame en cache ne sont pas modifiés
+    df = df.copy(deep=False)
+    df.attrs["empreinte"] = version
+    df.attrs["incremental"] = infos
+    if infos["mode"] != "complet":
+        # Le DataFrame complet (re)devient l'entrée de cache de cette version
+        ingestion.cache.put(cle, df, name)
+
+    nouvel_etat = EtatHistorique(
+        octets=len(content),
+        sha=_sha(content),
+        entete=content.split(b"\n", 1)[0] + b"\n",
+        version=version,
+        agregats=agregats,
+        schema=version_schema,
+        cle=cle,
+    )
+    # Le nouvel état remplace celui dont il descend
+    _etats.pop(cle_parent)
+    _etats.put((name, version_schema, nouvel_etat.sha), nouvel_etat, name)
+    if infos["mode"] != "inchange" and agregats is not None and snapshots.actif():
+        _sauver_etat(name, nouvel_etat, df, ecrire_snapshot=infos["mode"] == "delta")
+    return df, agregats, infos
+
+
+def charger_historique_df(name, content, schema=SCHEMA_MISES, feuille=None):
+    # Chargeur pour ingestion.lire_fichiers_safe ; les agrégats se récupèrent
+    # ensuite avec agregats_historique(df)
+    return charger_historique(name, content, schema, feuille)[0]
+
+
+def agregats_historique(df_mises):
+    # Agrégats tenus à jour pour cette version exacte de l'historique, sinon None
+    version = df_mises.attrs.get("empreinte")
+    for etat in _etats.values():
+        if version and etat.version == version:
+            return etat.agregats
+    return None
@@ -0,0 +1,379 @@
+import codecs
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import pandas as pd
+
+import memo
+import mesures
+import snapshots
+from memo import Memo
+from mesures import etape
+from schemas import appliquer_schema, colonnes_utiles
+
+
+class IngestionError(Exception):
+    pass
+
+
+# --- Cache des fichiers parsés ---
+# Streamlit ré-exécute tout le script à chaque interaction : on garde les DataFrames
+# déjà parsés, indexés par le SHA-256 du contenu et le schéma attendu. Le cache est
+# commun à tout le processus : deux sessions qui chargent le même fichier partagent
+# le même DataFrame (en lecture seule, chaque session reçoit une copie superficielle).
+# Son budget mémoire (LECLUB_CACHE_BUDGET_MO) est celui de memo.py, commun à tous les
+# mémos du processus : index, KPIs, figures et extracts y sont comptés aussi.
+CACHE_BUDGET_OCTETS = memo.BUDGET_OCTETS
+
+# Mode multi-équipes : une instance servant plusieurs incubateurs. Active le
+# copy-on-write de pandas < 3 (toujours actif ensuite) pour que les copies
+# superficielles ne puissent jamais modifier les données partagées, et le panneau
+# de suivi du cache dans les apps.
+MULTI_TENANT = os.environ.get("LECLUB_MULTI_TENANT", "0") != "0"
+if MULTI_TENANT and int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def taille_dataframe(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class ParsedFileCache(Memo):
+    """Cache LRU de DataFrames parsés, borné par le budget mémoire commun."""
+
+    def __init__(self):
+        super().__init__("ingestion", mesurer=taille_dataframe)
+
+    def jeux_residents(self):
+        # Du plus récemment utilisé au plus ancien
+        with self._lock:
+            return [
+                {"nom": infos["nom"], "sha": key[0][:12], "octets": taille, "hits": infos["hits"]}
+                for key, (_, taille, infos) in reversed(self._entrees.items())
+            ]
+
+
+cache = ParsedFileCache()
+
+
+def cache_key(name, content, expected_columns=None, schema=None, feuille=None, complet=False):
+    digest = hashlib.sha256(content).hexdigest()
+    extension = name.rsplit(".", 1)[-1].lower()
+    key = (digest, extension, tuple(expected_columns or ()), tuple((schema or {}).items()))
+    # Feuille et chargement complet n'entrent dans la clé que s'ils sont demandés
+    if feuille:
+        key += (("feuille", feuille),)
+    if complet:
+        key += ("complet",)
+    return key
+
+
+# --- Parsing ---
+# Mode "rapide" : encodage et séparateur détectés sans parser, puis un seul
+# parsing avec le moteur pyarrow (ou C). Mode "compatible" : l'ancienne boucle
+# engine="python" sur tous les encodages.
+MODE_CSV = "rapide"
+ECHANTILLON_OCTETS = 64 * 1024
+ENCODAGES_CSV = ["utf-8", "utf-8-sig", "ISO-8859-1"]
+SEPARATEURS_CSV = ",;\t|"
+
+
+def _moteurs_rapides():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ["c"]
+    return ["pyarrow", "c"]
+
+
+def detecter_encodage_blocs(blocs):
+    # Validation UTF-8 par blocs, sans construire la chaîne décodée : un export
+    # Latin-1 est rejeté dès le premier bloc dans la grande majorité des cas.
+    # Nécessaire pour pyarrow, qui renvoie des bytes au lieu d'échouer.
+    decodeur = codecs.getincrementaldecoder("utf-8")()
+    premier = True
+    try:
+        for bloc in blocs:
+            if premier and bloc.startswith(codecs.BOM_UTF8):
+                return "utf-8-sig"
+            premier = False
+            decodeur.decode(bloc)
+        decodeur.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "ISO-8859-1"
+    return "utf-8"
+
+
+def detecter_encodage(content):
+    return detecter_encodage_blocs(
+        content[debut:debut + ECHANTILLON_OCTETS] for debut in range(0, len(content), ECHANTILLON_OCTETS)
+    )
+
+
+def detecter_separateur(texte):
+    # On ignore la dernière ligne, potentiellement tronquée
+    lignes = texte.splitlines()[:-1] or texte.splitlines()
+    try:
+        return csv.Sniffer().sniff("\n".join(lignes[:50]), delimiters=SEPARATEURS_CSV).delimiter
+    except csv.Error:
+        return ","
+
+
+def colonnes_csv(texte, separateur, colonnes):
+    # Noms exacts (espaces compris) des colonnes retenues dans l'en-tête, pour
+    # usecols ; None = toutes (aucune projection, ou aucune colonne reconnue)
+    if colonnes is None:
+        return None
+    entete = next(csv.reader(io.StringIO(texte), delimiter=separateur), [])
+    retenues = [nom for nom in entete if nom.strip() in colonnes]
+    return retenues or None
+
+
+def _lire_csv_compatible(name, buffer, colonnes=None):
+    for enc in ENCODAGES_CSV:
+        try:
+            echantillon = buffer.getvalue()[:ECHANTILLON_OCTETS].decode(enc, errors="ignore")
+            usecols = colonnes_csv(echantillon, ",", colonnes)
+            buffer.seek(0)
+            df = pd.read_csv(buffer, encoding=enc, engine="python", usecols=usecols)
+            return df, {"moteur": "python", "encodage": enc, "separateur": ",", "repli": True}
+        except Exception:
+            pass
+    raise IngestionError(f"Impossible de lire le fichier {name} avec tous les encodages")
+
+
+def _lire_csv_rapide(name, content, buffer, colonnes=None):
+    encodage = detecter_encodage(content)
+    separateur = detecter_separateur(content[:ECHANTILLON_OCTETS].decode(encodage, errors="ignore"))
+
+    # En cas d'échec on réessaie les autres encodages avec un moteur rapide
+    # avant de retomber sur la boucle engine="python"
+    encodages = [encodage] + [e for e in ENCODAGES_CSV if e != encodage]
+    repli = False
+    for enc in encodages:
+        # Liste de noms plutôt qu'un callable : seule forme acceptée par pyarrow
+        usecols = colonnes_csv(content[:ECHANTILLON_OCTETS].decode(enc, errors="ignore"), separateur, colonnes)
+        for moteur in _moteurs_rapides():
+            try:
+                buffer.seek(0)
+                df = pd.read_csv(buffer, encoding=enc, sep=separateur, engine=moteur, usecols=usecols)
+                return df, {"moteur": moteur, "encodage": enc, "separateur": separateur, "repli": repli}
+            except Exception:
+                repli = True
+
+    return _lire_csv_compatible(name, buffer, colonnes)
+
+
+def parse_bytes(name, content, mode_csv=None, colonnes=None, feuille=None):
+    # colonnes : noms (après strip) des colonnes à lire, None = toutes ;
+    # feuille : onglet d'un XLSX
+    buffer = io.BytesIO(content)
+    mode_csv = mode_csv or MODE_CSV
+
+    if name.endswith(".csv"):
+        if mode_csv == "compatible":
+            df, infos = _lire_csv_compatible(name, buffer, colonnes)
+        else:
+            df, infos = _lire_csv_rapide(name, content, buffer, colonnes)
+    elif name.endswith(".xlsx"):
+        # openpyxl n'est importé qu'à la première lecture d'un XLSX
+        import excel
+
+        try:
+            df, infos = excel.lire(content, colonnes, feuille)
+        except Exception as e:
+            raise IngestionError(f"Impossible de lire le fichier {name} : {e}")
+    else:
+        raise IngestionError(f"Format de fichier non supporté : {name}")
+
+    df.columns = df.columns.str.strip()
+    # Chemin de lecture utilisé, consultable via df.attrs["ingestion"]
+    df.attrs["ingestion"] = infos
+    return df
+
+
+def colonnes_manquantes(df, expected_columns=None):
+    if not expected_columns:
+        return []
+    return [c for c in expected_columns if c not in df.columns]
+
+
+def signaler(message):
+    import streamlit as st
+    st.error(message)
+
+
+def panneau_cache():
+    # Suivi du cache partagé (mode multi-équipes), dans la barre latérale
+    import streamlit as st
+
+    stats = cache.stats()
+    with st.sidebar.expander("Cache partagé des jeux de données"):
+        st.metric("Jeux résidents", stats["entrees"])
+        # Mémoire de tous les mémos du processus, jeux de données compris
+        st.metric("Mémoire", f"{memo.octets_total() / 2**20:.1f} / {memo.BUDGET_OCTETS / 2**20:.0f} Mo")
+        st.caption(f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} évictions")
+        jeux = cache.jeux_residents()
+        if jeux:
+            st.dataframe(pd.DataFrame(jeux), hide_index=True)
+        st.dataframe(pd.DataFrame([m.stats() for m in memo.memos()]), hide_index=True)
+
+
+def empreinte(key):
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def construire_dataframe(name, content, schema, version, feuille=None, complet=False):
+    # Snapshot disque, sinon parsing et typage. Sans état : peut tourner dans un
+    # processus du pool. Avec un schéma, seules ses colonnes utiles sont lues,
+    # sauf chargement complet.
+    df = snapshots.charger(version) if snapshots.actif() else None
+    if df is None:
+        colonnes = colonnes_utiles(schema) if schema and not complet else None
+        with etape("lecture", name):
+            df = parse_bytes(name, content, colonnes=colonnes, feuille=feuille)
+        if schema:
+            df = appliquer_schema(df, schema)
+        if snapshots.actif():
+            snapshots.sauver(version, df)
+    # Identifie la version des données pour les calculs mémoïsés en aval
+    df.attrs["empreinte"] = version
+    return df
+
+
+# --- Pools de parsing ---
+# Les CSV sont parsés dans des threads (pyarrow et le moteur C relâchent le GIL) ;
+# openpyxl étant du Python pur, les XLSX partent dans un pool de processus.
+EXCEL_EN_PROCESSUS = os.environ.get("LECLUB_EXCEL_PROCESSUS", "1") != "0"
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(nature):
+    with _pools_lock:
+        if nature not in _pools:
+            if nature == "processus":
+                # spawn plutôt que fork : le serveur Streamlit a déjà des threads
+                _pools[nature] = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                _pools[nature] = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ingestion")
+        return _pools[nature]
+
+
+def _construire_mesure(options, *args):
+    # Exécuté dans un processus du pool : les mesures reviennent avec le DataFrame
+    with mesures.capturer(options) as releves:
+        df = construire_dataframe(*args)
+    return df, releves
+
+
+def _construire_en_processus(name, content, schema, version, feuille=None, complet=False):
+    try:
+        df, releves = _pool("processus").submit(
+            _construire_mesure, mesures.etat(), name, content, schema, version, feuille, complet
+        ).result()
+        mesures.importer(releves)
+        return df
+    except BrokenProcessPool:
+        # Processus tué (mémoire) ou interdit par l'environnement : on parse ici
+        with _pools_lock:
+            _pools.pop("processus", None)
+        return construire_dataframe(name, content, schema, version, feuille, complet)
+
+
+def charger_dataframe(name, content, expected_columns=None, schema=None, en_processus=False, feuille=None,
+                      complet=False):
+    # Cache mémoire, puis snapshot disque, puis parsing.
+    # Lève IngestionError ; utilisable hors Streamlit (CLI, benchmarks).
+    # en_processus : parse un XLSX dans le pool de processus.
+    # feuille : onglet d'un XLSX (la première feuille par défaut).
+    # complet : toutes les colonnes du fichier, pas seulement celles du schéma.
+    if expected_columns is None and schema:
+        expected_columns = colonnes_utiles(schema)
+
+    key = cache_key(name, content, expected_columns, schema, feuille, complet)
+    version = empreinte(key)
+    if en_processus and EXCEL_EN_PROCESSUS and name.endswith(".xlsx"):
+        construire = partial(_construire_en_processus, name, content, schema, version, feuille, complet)
+    else:
+        construire = partial(construire_dataframe, name, content, schema, version, feuille, complet)
+    return cache.obtenir(key, construire, nom=name)
+
+
+def charger_dataframe_complet(name, content, schema=None, feuille=None):
+    # Chargeur pour lire_fichiers_safe : toutes les colonnes du fichier, pour les
+    # vues qui affichent les lignes brutes (vues/explorateur.py)
+    return charger_dataframe(name, content, schema=schema, en_processus=True, feuille=feuille, complet=True)
+
+
+# --- Choix de la feuille Excel ---
+def choisir_feuille(uploaded_file):
+    # Sélecteur dans la barre latérale, affiché seulement pour un XLSX à
+    # plusieurs feuilles ; None = première feuille
+    if uploaded_file is None or uploaded_file.size == 0 or not uploaded_file.name.endswith(".xlsx"):
+        return None
+    import excel
+
+    try:
+        feuilles = excel.feuilles(uploaded_file.getvalue())
+    except Exception:
+        # Fichier illisible : l'erreur sera signalée par la lecture elle-même
+        return None
+    if len(feuilles) < 2:
+        return None
+
+    import streamlit as st
+
+    return st.sidebar.selectbox(
+        f"Feuille de {uploaded_file.name}", feuilles, key=f"feuille-{uploaded_file.name}"
+    )
+
+
+def _lire(uploaded_file, schema, chargeur, feuille=None):
+    if uploaded_file is None or uploaded_file.size == 0:
+        return None, f"Le fichier {uploaded_file.name if uploaded_file else 'inconnu'} est vide !"
+    # feuille n'est transmise que si elle a été choisie : les chargeurs
+    # spécifiques (historique CSV) ne la connaissent pas forcément
+    options = {"feuille": feuille} if feuille else {}
+    try:
+        with etape("ingestion", uploaded_file.name):
+            return chargeur(uploaded_file.name, uploaded_file.getvalue(), schema=schema, **options), None
+    except IngestionError as e:
+        return None, str(e)
+
+
+def lire_fichiers_safe(demandes):
+    # demandes : liste de (uploaded_file, schema) ou (uploaded_file, schema, chargeur),
+    # chargeur(name, content, schema=...) renvoyant un DataFrame (charger_dataframe
+    # par défaut). Les fichiers sont parsés en parallèle ; les erreurs sont signalées
+    # fichier par fichier, dans l'ordre, depuis le thread du script Streamlit.
+    futures = []
+    for demande in demandes:
+        uploaded_file, schema = demande[0], demande[1]
+        chargeur = demande[2] if len(demande) > 2 else partial(charger_dataframe, en_processus=True)
+        # Le sélecteur de feuille est un widget : créé ici, dans le thread du script
+        feuille = choisir_feuille(uploaded_file)
+        futures.append(_pool("threads").submit(_lire, uploaded_file, schema, chargeur, feuille))
+
+    resultats = []
+    for demande, future in zip(demandes, futures):
+        uploaded_file, schema = demande[0], demande[1]
+        df, erreur = future.result()
+        if erreur:
+            signaler(erreur)
+            resultats.append(pd.DataFrame())
+            continue
+        missing_cols = colonnes_manquantes(df, colonnes_utiles(schema or {}))
+        if missing_cols:
+            signaler(f"Colonnes manquantes dans {uploaded_file.name} : {missing_cols}")
+        # Copie superficielle : les vues réassignent des colonnes (dates, trimestres)
+        # sans jamais modifier en place les données partagées du cache.
+        resultats.append(df.copy(deep=False))
+    return resultats
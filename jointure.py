@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from memo import Memo
+from mesures import mesure
+
+# --- Index utilisateurs -> demandes ---
+# Construit une fois par version de l'historique et de la base globale : chaque
+# ligne de la base globale porte le code de son "Name" parmi les "Utilisateur" de
+# l'historique, et chaque code ses comptages de demandes (total et par statut).
+# Les KPIs Marketplace filtrés ne coûtent plus qu'en proportion des profils
+# retenus, sans isin sur tout l'historique.
+COLONNE_STATUT = "Statut des mises en relation à date"
+# Colonnes lues par l'index, par fichier (voir kpis.schema_kpis)
+COLONNES_JOINTURE = {
+    "mises": ["Utilisateur", COLONNE_STATUT],
+    "globale": ["Name"],
+}
+
+
+@dataclass(frozen=True)
+class IndexDemandes:
+    codes_globale: np.ndarray        # code utilisateur de chaque ligne de df_globale, -1 sans demande
+    demandes_par_code: np.ndarray    # nombre de demandes par code utilisateur
+    statuts_par_code: np.ndarray     # matrice codes x statuts
+    statuts: pd.Index
+
+    @classmethod
+    @mesure("kpis.jointure")
+    def depuis(cls, df_mises, df_globale):
+        codes, utilisateurs = pd.factorize(df_mises["Utilisateur"], use_na_sentinel=False)
+        nb_utilisateurs = len(utilisateurs)
+
+        statut = df_mises[COLONNE_STATUT]
+        if not isinstance(statut.dtype, pd.CategoricalDtype):
+            statut = statut.astype("category")
+        codes_statut = statut.cat.codes.to_numpy()
+        nb_statuts = len(statut.cat.categories)
+
+        # Les statuts manquants comptent dans les demandes, pas dans la répartition
+        renseigne = codes_statut >= 0
+        cellules = np.bincount(
+            codes[renseigne] * nb_statuts + codes_statut[renseigne],
+            minlength=nb_utilisateurs * nb_statuts,
+        )
+        return cls(
+            codes_globale=pd.Index(utilisateurs).get_indexer(df_globale["Name"]),
+            demandes_par_code=np.bincount(codes, minlength=nb_utilisateurs),
+            statuts_par_code=cellules.reshape(nb_utilisateurs, nb_statuts),
+            statuts=pd.CategoricalIndex(statut.cat.categories, dtype=statut.dtype, name=COLONNE_STATUT),
+        )
+
+    def _codes(self, retenu):
+        # Un utilisateur compte une fois même si son nom figure sur plusieurs lignes
+        codes = np.unique(self.codes_globale[retenu])
+        return codes[codes >= 0]
+
+    def demandes(self, retenu):
+        return int(self.demandes_par_code[self._codes(retenu)].sum())
+
+    def statuts_demandes(self, retenu):
+        # Même résultat que compter_valeurs sur le statut des demandes retenues
+        counts = pd.Series(
+            self.statuts_par_code[self._codes(retenu)].sum(axis=0), index=self.statuts, name="count"
+        )
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+
+# --- Mémoïsation sur les empreintes de l'historique et de la base globale ---
+INDEX_TAILLE = 8
+_index = Memo("jointure", INDEX_TAILLE)
+
+
+def index_memoise(df_mises, df_globale, version):
+    return _index.obtenir(version, lambda: IndexDemandes.depuis(df_mises, df_globale))
@@ -0,0 +1,273 @@
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from connexions import IndexConnexions, connexions_memoise
+from cube import DIMENSIONS_GLOBALE, CubeGlobale, cube_memoise
+from memo import Memo
+from mesures import etape, mesure
+from schemas import SCHEMAS_ROLES, compter_valeurs, projeter
+
+
+# --- Résultats des KPIs ---
+# Calculés une seule fois par version des données, puis consommés tels quels par
+# l'affichage Streamlit et par les exports (DOCX).
+@dataclass(frozen=True)
+class ResultatsKPI:
+    date_calcul: datetime
+
+    # Datas globales
+    demandes_total: int
+    profils_total: int
+    profils_connectes: int
+
+    # Marketplace
+    go_between_valides: int
+    rdv_realises: float
+    rdv_non_realises: float
+    statuts_mises: pd.Series
+    taux_go_between: float
+    taux_rdv: float
+    trimestriel: pd.Series
+    rollups: dict
+
+    # Profils persos & Sociétés
+    nb_entrepreneurs: int
+    statut_users: pd.Series
+    statut_entreprises: pd.Series
+
+    # Complétion des profils
+    profil_personnel: pd.Series
+    profil_societes: pd.Series
+    par_car_sum: pd.Series
+    par_incubateur: pd.Series
+    completion_incubation_indiv: pd.Series
+
+
+# --- Agrégats Marketplace ---
+# Sommes et comptages additifs : un lot de lignes supplémentaire se combine aux
+# agrégats existants sans relire l'historique (ingestion incrémentale, lecture
+# par blocs).
+COLONNES_MARKETPLACE = [
+    "Statut des mises en relation à date",
+    "Dates simples",
+    "RDV réalisés",
+    "Taux de conversion goBetween",
+    "Taux de conversion RDV réalisé",
+    "Go between validé",
+    "Rdv non réalisé",
+]
+
+
+MESURES_ROLLUP = ["demandes", "go_between_valides", "rdv_realises"]
+NOMS_PERIODES = {"M": "Mois", "Q": "Trimestre", "Y": "Année"}
+
+
+@dataclass
+class AgregatsMarketplace:
+    nb_demandes: int = 0
+    go_between_valides: int = 0
+    rdv_realises: float = 0
+    rdv_non_realises: float = 0
+    somme_taux_go_between: float = 0.0
+    nb_taux_go_between: int = 0
+    somme_taux_rdv: float = 0.0
+    nb_taux_rdv: int = 0
+    statuts: dict = field(default_factory=dict)
+    # {"AAAA-MM": [demandes, go_between_valides, rdv_realises]}
+    mois: dict = field(default_factory=dict)
+
+    @classmethod
+    def depuis(cls, df_mises):
+        agregats = cls()
+        agregats.ajouter(df_mises)
+        return agregats
+
+    @mesure("kpis.marketplace")
+    def ajouter(self, df_mises):
+        self.nb_demandes += len(df_mises)
+        self.go_between_valides += int((df_mises["Go between validé"] == "Oui").sum())
+        self.rdv_realises += df_mises["RDV réalisés"].sum()
+        self.rdv_non_realises += df_mises["Rdv non réalisé"].sum()
+
+        taux = df_mises["Taux de conversion goBetween"]
+        self.somme_taux_go_between += float(taux.sum())
+        self.nb_taux_go_between += int(taux.count())
+        taux = df_mises["Taux de conversion RDV réalisé"]
+        self.somme_taux_rdv += float(taux.sum())
+        self.nb_taux_rdv += int(taux.count())
+
+        for statut, count in compter_valeurs(df_mises["Statut des mises en relation à date"]).items():
+            self.statuts[statut] = self.statuts.get(statut, 0) + int(count)
+
+        # Rollup mensuel en une passe ; trimestres et années s'en déduisent
+        par_mois = pd.DataFrame({
+            "demandes": 1,
+            "go_between_valides": (df_mises["Go between validé"] == "Oui").to_numpy(dtype="int64"),
+            "rdv_realises": df_mises["RDV réalisés"].to_numpy(dtype="float64"),
+        }, index=df_mises.index).groupby(df_mises["Dates simples"].dt.to_period("M"), observed=True).sum()
+        for mois, (demandes, go_between, rdv) in zip(par_mois.index, par_mois.to_numpy().tolist()):
+            cumul = self.mois.setdefault(str(mois), [0, 0, 0.0])
+            cumul[0] += int(demandes)
+            cumul[1] += int(go_between)
+            cumul[2] += float(rdv)
+        return self
+
+    @property
+    def taux_go_between(self):
+        return round(self.somme_taux_go_between / self.nb_taux_go_between, 2) if self.nb_taux_go_between else float("nan")
+
+    @property
+    def taux_rdv(self):
+        return round(self.somme_taux_rdv / self.nb_taux_rdv, 2) if self.nb_taux_rdv else float("nan")
+
+    def statuts_series(self):
+        serie = pd.Series(self.statuts, dtype="int64", name="count")
+        serie.index.name = "Statut des mises en relation à date"
+        return serie.sort_values(ascending=False, kind="stable")
+
+    def rollup(self, granularite="Q"):
+        # Une ligne par période (sans trou) : valeurs, cumuls et écarts à la période
+        # précédente pour chaque mesure
+        index = pd.PeriodIndex(sorted(self.mois), freq="M")
+        valeurs = pd.DataFrame(
+            [self.mois[str(m)] for m in index], index=index, columns=MESURES_ROLLUP
+        ).astype({"demandes": "int64", "go_between_valides": "int64", "rdv_realises": "float64"})
+        valeurs = valeurs.groupby(index.asfreq(granularite)).sum()
+        if len(valeurs):
+            valeurs = valeurs.reindex(
+                pd.period_range(valeurs.index[0], valeurs.index[-1], freq=granularite), fill_value=0
+            )
+        valeurs.index.name = NOMS_PERIODES[granularite]
+
+        rollup = {}
+        for nom in MESURES_ROLLUP:
+            rollup[nom] = valeurs[nom]
+            rollup[f"cumul_{nom}"] = valeurs[nom].cumsum()
+            rollup[f"delta_{nom}"] = valeurs[nom].diff()
+        return pd.DataFrame(rollup)
+
+    def trimestriel_series(self):
+        return self.rollup("Q")["demandes"].rename(None)
+
+    def vers_dict(self):
+        return {k: (v.item() if hasattr(v, "item") else v) for k, v in self.__dict__.items()}
+
+    @classmethod
+    def depuis_dict(cls, valeurs):
+        if "mois" not in valeurs:
+            # État enregistré avant les rollups mensuels : à recalculer
+            raise ValueError("agrégats Marketplace dans un format obsolète")
+        return cls(**valeurs)
+
+
+def empreinte_dataframe(df):
+    # Empreinte posée à l'ingestion (SHA du contenu + schéma) ; à défaut on
+    # hache les valeurs
+    empreinte = df.attrs.get("empreinte")
+    if empreinte:
+        return empreinte
+    valeurs = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha256(valeurs.tobytes() + repr(list(df.columns)).encode()).hexdigest()
+
+
+COLONNE_CONNEXION = "Date de dernière connexion"
+
+
+# --- Colonnes lues par les KPIs ---
+# Projection appliquée à l'ingestion : les dashboards ne chargent que ces colonnes
+# (plus celles de leurs propres vues), les autres ne sont ni parsées ni gardées
+# en mémoire. Toute colonne lue par calculer_kpis doit figurer ici.
+COLONNES_KPIS = {
+    "users": ["Statut", COLONNE_CONNEXION],
+    "entreprises": ["Statut"],
+    "mises": COLONNES_MARKETPLACE,
+    "globale": DIMENSIONS_GLOBALE,
+}
+
+
+def schema_kpis(role, *vues):
+    # vues : dictionnaires {role: colonnes} des colonnes lues en plus des KPIs
+    colonnes = set(COLONNES_KPIS[role]).union(*(vue.get(role, ()) for vue in vues))
+    return projeter(SCHEMAS_ROLES[role], colonnes)
+
+
+@mesure("kpis")
+def calculer_kpis(df_users, df_entreprises, df_mises, df_globale, today=None, marketplace=None, cube=None,
+                  connexions=None):
+    # Fonction pure : aucune colonne n'est ajoutée ni modifiée sur les DataFrames.
+    # marketplace : AgregatsMarketplace déjà tenus à jour (ingestion incrémentale)
+    # cube : CubeGlobale de df_globale déjà construit pour cette version
+    # connexions : IndexConnexions des dernières connexions de df_users
+    today = today or datetime.today()
+    month_ago = today - timedelta(days=30)
+    if marketplace is None:
+        marketplace = AgregatsMarketplace.depuis(df_mises)
+    if cube is None:
+        cube = CubeGlobale.depuis(df_globale)
+    if connexions is None:
+        connexions = IndexConnexions.depuis(df_users, COLONNE_CONNEXION)
+
+    with etape("kpis.rollups"):
+        rollups = {granularite: marketplace.rollup(granularite) for granularite in NOMS_PERIODES}
+    with etape("kpis.statuts"):
+        statut_users = compter_valeurs(df_users["Statut"])
+        statut_entreprises = compter_valeurs(df_entreprises["Statut"])
+    with etape("kpis.completion"):
+        incubation_indiv = cube.filtrer(**{"Statut d'incubation": "Incubation individuelle"})
+        completion = {
+            "profil_personnel": cube.compter("Profil personnel Le Club"),
+            "profil_societes": cube.compter("Profil sociétés Le Club"),
+            "par_car_sum": cube.compter("Profil sociétés Le Club", par="CAR/SUM (territorial)"),
+            "par_incubateur": cube.compter("Profil sociétés Le Club", par="Incubateur territorial"),
+            "completion_incubation_indiv": incubation_indiv.compter(
+                "Profil sociétés Le Club", normalize=True
+            ).mul(100).round(2),
+        }
+
+    return ResultatsKPI(
+        date_calcul=today,
+        demandes_total=marketplace.nb_demandes,
+        profils_total=len(df_users),
+        profils_connectes=connexions.actifs(debut=month_ago),
+        go_between_valides=marketplace.go_between_valides,
+        rdv_realises=marketplace.rdv_realises,
+        rdv_non_realises=marketplace.rdv_non_realises,
+        statuts_mises=marketplace.statuts_series(),
+        taux_go_between=marketplace.taux_go_between,
+        taux_rdv=marketplace.taux_rdv,
+        trimestriel=marketplace.trimestriel_series(),
+        rollups=rollups,
+        nb_entrepreneurs=len(df_globale),
+        statut_users=statut_users,
+        statut_entreprises=statut_entreprises,
+        **completion,
+    )
+
+
+# --- Mémoïsation sur l'empreinte des données ---
+# Le jour fait partie de la clé : "connectés sur le mois" dépend de la date.
+MEMO_TAILLE = 16
+_memo = Memo("kpis", MEMO_TAILLE)
+
+
+def cle_donnees(df_users, df_entreprises, df_mises, df_globale):
+    return (
+        empreinte_dataframe(df_users),
+        empreinte_dataframe(df_entreprises),
+        empreinte_dataframe(df_mises),
+        empreinte_dataframe(df_globale),
+        datetime.today().date(),
+    )
+
+
+def kpis_memoises(df_users, df_entreprises, df_mises, df_globale, marketplace=None):
+    cle = cle_donnees(df_users, df_entreprises, df_mises, df_globale)
+    return _memo.obtenir(cle, lambda: calculer_kpis(
+        df_users, df_entreprises, df_mises, df_globale,
+        marketplace=marketplace,
+        cube=cube_memoise(df_globale, cle[3]),
+        connexions=connexions_memoise(df_users, cle[0], COLONNE_CONNEXION),
+    ))
@@ -0,0 +1,197 @@
+import itertools
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# --- Taille mémoire d'une valeur mémoïsée ---
+def taille_objet(valeur, _vus=None):
+    # Estimation en octets de ce que retient valeur : DataFrames, Series et
+    # tableaux NumPy sont comptés par leur contenu, le reste par sys.getsizeof en
+    # parcourant conteneurs et attributs. Un objet partagé n'est compté qu'une fois.
+    if _vus is None:
+        _vus = set()
+    if id(valeur) in _vus:
+        return 0
+    _vus.add(id(valeur))
+    if isinstance(valeur, pd.DataFrame):
+        return int(valeur.memory_usage(index=True, deep=True).sum())
+    if isinstance(valeur, (pd.Series, pd.Index)):
+        return int(valeur.memory_usage(deep=True))
+    if isinstance(valeur, np.ndarray):
+        if valeur.dtype == object:
+            return valeur.nbytes + sum(taille_objet(v, _vus) for v in valeur.flat)
+        return valeur.nbytes
+    taille = sys.getsizeof(valeur)
+    if isinstance(valeur, (str, bytes, bytearray, int, float)):
+        return taille
+    if isinstance(valeur, dict):
+        return taille + sum(taille_objet(k, _vus) + taille_objet(v, _vus) for k, v in valeur.items())
+    if isinstance(valeur, (list, tuple, set, frozenset)):
+        return taille + sum(taille_objet(v, _vus) for v in valeur)
+    if hasattr(valeur, "__dict__"):
+        taille += taille_objet(vars(valeur), _vus)
+    for nom in getattr(type(valeur), "__slots__", ()):
+        taille += taille_objet(getattr(valeur, nom, None), _vus)
+    return taille
+
+
+# --- Budget mémoire commun ---
+# Tous les mémos du processus (jeux de données parsés d'ingestion.cache, index,
+# KPIs, figures, extracts...) partagent un même budget : au-delà, les entrées
+# les moins récemment utilisées, tous mémos confondus, sont évincées.
+BUDGET_OCTETS = int(os.environ.get("LECLUB_CACHE_BUDGET_MO", "512")) * 1024 * 1024
+
+_memos = weakref.WeakSet()
+_horloge = itertools.count()
+_budget_lock = threading.Lock()
+
+
+def memos():
+    return sorted(_memos, key=lambda memo: memo.nom)
+
+
+def octets_total():
+    return sum(memo.octets for memo in list(_memos))
+
+
+def respecter_budget():
+    with _budget_lock:
+        while octets_total() > BUDGET_OCTETS:
+            candidats = [(memo._plus_ancien(), memo) for memo in list(_memos)]
+            candidats = [(acces, memo) for acces, memo in candidats if acces is not None]
+            if not candidats:
+                return
+            min(candidats, key=lambda candidat: candidat[0])[1]._evincer_plus_ancien()
+
+
+# --- Mémo LRU partagé par le processus ---
+class Memo:
+    """Cache LRU de valeurs calculées (par version des données), borné en nombre
+    d'entrées et par le budget mémoire commun ; chaque entrée est mesurée en
+    octets (taille_objet par défaut)."""
+
+    def __init__(self, nom, taille=None, mesurer=taille_objet):
+        self.nom = nom
+        self.taille = taille
+        self.mesurer = mesurer
+        self._entrees = OrderedDict()
+        self._en_cours = {}
+        self._lock = threading.Lock()
+        self.octets = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _memos.add(self)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entrees)
+
+    def get(self, key):
+        with self._lock:
+            entree = self._entrees.get(key)
+            if entree is None:
+                self.misses += 1
+                return None
+            self._entrees.move_to_end(key)
+            self.hits += 1
+            entree[2]["hits"] += 1
+            entree[2]["acces"] = next(_horloge)
+            return entree[0]
+
+    def put(self, key, valeur, nom=None):
+        octets = self.mesurer(valeur)
+        with self._lock:
+            if key in self._entrees:
+                self.octets -= self._entrees.pop(key)[1]
+            # Une valeur plus grosse que tout le budget n'est pas gardée
+            if octets > BUDGET_OCTETS:
+                return
+            self._entrees[key] = (valeur, octets, {"nom": nom, "hits": 0, "acces": next(_horloge)})
+            self.octets += octets
+            while self.taille is not None and len(self._entrees) > self.taille:
+                self._evincer()
+        respecter_budget()
+
+    def obtenir(self, key, construire, nom=None):
+        # get, sinon construire() une seule fois même si plusieurs sessions
+        # demandent la même clé en même temps : les autres attendent le résultat
+        while True:
+            valeur = self.get(key)
+            if valeur is not None:
+                return valeur
+            with self._lock:
+                evenement = self._en_cours.get(key)
+                if evenement is None:
+                    evenement = self._en_cours[key] = threading.Event()
+                    proprietaire = True
+                else:
+                    proprietaire = False
+            if not proprietaire:
+                # Après l'attente, l'entrée est en cache ; sinon (échec, entrée
+                # déjà évincée) on reprend la boucle et on construit soi-même
+                evenement.wait()
+                continue
+            try:
+                valeur = construire()
+                self.put(key, valeur, nom)
+                return valeur
+            finally:
+                with self._lock:
+                    self._en_cours.pop(key, None)
+                evenement.set()
+
+    def pop(self, key):
+        with self._lock:
+            entree = self._entrees.pop(key, None)
+            if entree is None:
+                return None
+            self.octets -= entree[1]
+            return entree[0]
+
+    def items(self):
+        # Du moins récemment utilisé au plus récent
+        with self._lock:
+            return [(key, entree[0]) for key, entree in self._entrees.items()]
+
+    def values(self):
+        return [valeur for _, valeur in self.items()]
+
+    def _evincer(self):
+        # Appelé avec self._lock
+        _, (_, octets, _) = self._entrees.popitem(last=False)
+        self.octets -= octets
+        self.evictions += 1
+
+    def _plus_ancien(self):
+        with self._lock:
+            for _, _, infos in self._entrees.values():
+                return infos["acces"]
+        return None
+
+    def _evincer_plus_ancien(self):
+        with self._lock:
+            if self._entrees:
+                self._evincer()
+
+    def clear(self):
+        with self._lock:
+            self._entrees.clear()
+            self.octets = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "nom": self.nom,
+                "entrees": len(self._entrees),
+                "octets": self.octets,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
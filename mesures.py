@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+import pandas as pd
+
+# --- Mesures des étapes du pipeline ---
+# Chaque étape (lecture, typage, blocs de KPIs, graphiques, extracts) est
+# enveloppée par etape() ou @mesure : désactivées, elles ne coûtent qu'un test.
+# Activées (LECLUB_MESURES=1, ou =memoire pour le pic mémoire), chaque étape
+# relève son temps mur, son temps CPU et, en option, son pic mémoire Python
+# (tracemalloc, qui ralentit les allocations).
+#   - Le temps CPU est celui du thread de l'étape : le travail délégué à un pool
+#     apparaît dans les étapes de ce pool.
+#   - Le pic mémoire est global au processus : approximatif quand des étapes
+#     tournent en parallèle.
+# Les relevés récents restent en mémoire (panneau de debug, export JSON) et, si
+# LECLUB_MESURES_JOURNAL est défini, sont ajoutés à ce fichier (une ligne JSON
+# par étape) pour suivre les tendances d'un déploiement à l'autre.
+_MODE = os.environ.get("LECLUB_MESURES", "0")
+# DEBUG : les dashboards affichent le panneau (qui peut ensuite suspendre les relevés)
+DEBUG = _MODE != "0"
+ACTIF = DEBUG
+MEMOIRE = _MODE == "memoire"
+JOURNAL = os.environ.get("LECLUB_MESURES_JOURNAL")
+RELEVES_TAILLE = 1000
+
+_releves = deque(maxlen=RELEVES_TAILLE)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def activer(actif=True, memoire=False):
+    global ACTIF, MEMOIRE
+    ACTIF, MEMOIRE = actif, actif and memoire
+    if MEMOIRE and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not MEMOIRE and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+if MEMOIRE:
+    activer(True, True)
+
+
+def _enregistrer(releve):
+    with _lock:
+        _releves.append(releve)
+        if JOURNAL:
+            with open(JOURNAL, "a", encoding="utf-8") as f:
+                f.write(json.dumps(releve, ensure_ascii=False) + "\n")
+    capture = getattr(_local, "capture", None)
+    if capture is not None:
+        capture.append(releve)
+
+
+@contextmanager
+def etape(nom, detail=None):
+    if not ACTIF:
+        yield
+        return
+
+    # Pile par thread : le pic d'une étape englobante tient compte de ses
+    # sous-étapes, malgré le reset_peak fait à l'entrée de chacune
+    pile = getattr(_local, "pile", None)
+    if pile is None:
+        pile = _local.pile = []
+    memoire = MEMOIRE and tracemalloc.is_tracing()
+    cadre = {"depart": 0, "pic": 0}
+    if memoire:
+        courant, pic = tracemalloc.get_traced_memory()
+        if pile:
+            pile[-1]["pic"] = max(pile[-1]["pic"], pic)
+        tracemalloc.reset_peak()
+        cadre["depart"] = courant
+    pile.append(cadre)
+
+    date = datetime.now().isoformat(timespec="milliseconds")
+    debut_mur, debut_cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        mur, cpu = time.perf_counter() - debut_mur, time.thread_time() - debut_cpu
+        pile.pop()
+        pic_memoire = None
+        if memoire and tracemalloc.is_tracing():
+            pic = max(tracemalloc.get_traced_memory()[1], cadre["pic"])
+            if pile:
+                pile[-1]["pic"] = max(pile[-1]["pic"], pic)
+            pic_memoire = max(pic - cadre["depart"], 0)
+        _enregistrer({
+            "date": date,
+            "etape": nom,
+            "detail": None if detail is None else str(detail),
+            "mur_s": round(mur, 6),
+            "cpu_s": round(cpu, 6),
+            "pic_memoire_octets": pic_memoire,
+            "processus": os.getpid(),
+            "thread": threading.current_thread().name,
+        })
+
+
+def mesure(nom):
+    # Décorateur : toute la fonction est une étape
+    def decorateur(fonction):
+        @wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            with etape(nom):
+                return fonction(*args, **kwargs)
+        return enveloppe
+    return decorateur
+
+
+# --- Relevés faits dans un autre processus ---
+@contextmanager
+def capturer(options=None):
+    # Dans un processus du pool : options = etat() du processus parent ;
+    # renvoie la liste des relevés faits dans le bloc, à passer à importer()
+    if options is not None:
+        activer(*options)
+    _local.capture = releves = []
+    try:
+        yield releves
+    finally:
+        _local.capture = None
+
+
+def etat():
+    return ACTIF, MEMOIRE
+
+
+def importer(releves):
+    # Déjà écrits au journal par le processus qui les a faits
+    with _lock:
+        _releves.extend(releves)
+
+
+def releves():
+    with _lock:
+        return list(_releves)
+
+
+def vider():
+    with _lock:
+        _releves.clear()
+
+
+def exporter_json(liste=None):
+    return json.dumps(releves() if liste is None else liste, ensure_ascii=False, indent=2)
+
+
+def synthese(liste):
+    # Par étape : nombre d'appels, temps mur (médiane, max), CPU et pic mémoire max
+    if not liste:
+        return pd.DataFrame()
+    df = pd.DataFrame(liste)
+    resume = df.groupby("etape", sort=False).agg(
+        appels=("mur_s", "size"),
+        mur_median_s=("mur_s", "median"),
+        mur_max_s=("mur_s", "max"),
+        cpu_total_s=("cpu_s", "sum"),
+        pic_memoire_mo=("pic_memoire_octets", "max"),
+    )
+    resume["pic_memoire_mo"] = resume["pic_memoire_mo"] / 2**20
+    return resume.sort_values("mur_max_s", ascending=False).round(4)
+
+
+def panneau_mesures():
+    # Panneau de debug dans la barre latérale ; les réglages valent pour tout
+    # le processus (toutes les sessions)
+    import streamlit as st
+
+    with st.sidebar.expander("Debug : mesures des étapes"):
+        actif = st.checkbox("Relever les mesures", value=ACTIF, key="mesures-actif")
+        memoire = st.checkbox("Pic mémoire (tracemalloc, ralentit)", value=MEMOIRE, key="mesures-memoire")
+        if (actif, actif and memoire) != etat():
+            activer(actif, memoire)
+
+        liste = releves()
+        st.caption(f"{len(liste)} relevés en mémoire" + (f", journal : {JOURNAL}" if JOURNAL else ""))
+        if liste:
+            st.dataframe(synthese(liste))
+            st.dataframe(pd.DataFrame(liste[-50:][::-1]), hide_index=True)
+            st.download_button(
+                "Exporter les mesures (JSON)", exporter_json(liste),
+                file_name=f"mesures_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json", key="mesures-export",
+            )
+            if st.button("Vider les relevés", key="mesures-vider"):
+                vider()
@@ -0,0 +1,347 @@
+import io
+import os
+import re
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from fpdf import FPDF
+
+from mesures import mesure
+
+
+# --- Tableaux DOCX ---
+# Un tableau est construit en un seul fragment XML puis rattaché au document :
+# python-docx parcourt le XML à chaque accès à une cellule, ce qui rend
+# add_row()/cell().text quadratique sur les grandes répartitions.
+_CARACTERES_INTERDITS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _cellule_xml(valeur, gras=False):
+    texte = escape(_CARACTERES_INTERDITS.sub("", str(valeur)))
+    proprietes = "<w:rPr><w:b/></w:rPr>" if gras else ""
+    return f'<w:tc><w:p><w:r>{proprietes}<w:t xml:space="preserve">{texte}</w:t></w:r></w:p></w:tc>'
+
+
+def ajouter_tableau(doc, entete, lignes, style="Table Grid"):
+    table = doc.add_table(rows=0, cols=len(entete))
+    table.style = style
+    rangees = ["<w:tr>" + "".join(_cellule_xml(v, gras=True) for v in entete) + "</w:tr>"]
+    rangees += ["<w:tr>" + "".join(_cellule_xml(v) for v in ligne) + "</w:tr>" for ligne in lignes]
+    fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(rangees)}</w:tbl>")
+    table._tbl.extend(list(fragment))
+    return table
+
+
+def ajouter_repartition(doc, counts, entete):
+    # counts : Série (index simple ou MultiIndex) -> une ligne par valeur
+    lignes = [
+        (*(valeur if isinstance(valeur, tuple) else (valeur,)), count)
+        for valeur, count in counts.items()
+    ]
+    return ajouter_tableau(doc, entete, lignes)
+
+
+def ajouter_tableau_croise(doc, counts, libelle):
+    # counts : Série indexée (groupe, profil) -> tableau groupes x profils
+    croise = counts.unstack(fill_value=0)
+    lignes = [(groupe, *valeurs) for groupe, valeurs in zip(croise.index, croise.to_numpy().tolist())]
+    return ajouter_tableau(doc, [libelle, *croise.columns], lignes)
+
+
+# Colonnes du rollup reprises dans les extracts
+COLONNES_ROLLUP = {
+    "demandes": "Demandes",
+    "go_between_valides": "Go Between validés",
+    "rdv_realises": "RDV réalisés",
+    "cumul_demandes": "Cumul demandes",
+    "delta_demandes": "Écart demandes",
+}
+
+
+def _nombre(valeur):
+    if pd.isna(valeur):
+        return ""
+    return int(valeur) if float(valeur).is_integer() else round(float(valeur), 2)
+
+
+def lignes_rollup(rollup):
+    # rollup : AgregatsMarketplace.rollup -> (entête, lignes) prêtes pour un tableau
+    entete = [rollup.index.name or "Période", *COLONNES_ROLLUP.values()]
+    colonnes = rollup[list(COLONNES_ROLLUP)].to_numpy().tolist()
+    lignes = [(str(periode), *map(_nombre, valeurs)) for periode, valeurs in zip(rollup.index, colonnes)]
+    return entete, lignes
+
+
+def ajouter_rollup(doc, rollup):
+    return ajouter_tableau(doc, *lignes_rollup(rollup))
+
+
+# --- Génération du DOCX avec uniquement les datas ---
+# Le document ne recalcule rien : il sérialise un ResultatsKPI (voir kpis.py).
+# pivot (optionnel) : répartitions par CAR/SUM et par incubateur en tableau
+# croisé (groupes x profils) plutôt qu'une ligne par couple.
+@mesure("rapport.docx")
+def generate_docx_metrics(resultats, pivot=False):
+    doc = Document()
+    doc.add_heading("Dashboard Marketplace & Incubateur - Extract", 0)
+
+    # Datas globales
+    doc.add_heading("Datas globales", level=1)
+    doc.add_paragraph(f"Demandes de mise en relation: {resultats.demandes_total}")
+    doc.add_paragraph(f"Profils créés: {resultats.profils_total}")
+    doc.add_paragraph(f"Profils connectés sur le mois: {resultats.profils_connectes}")
+
+    # Marketplace
+    doc.add_heading("Marketplace", level=1)
+    doc.add_heading("Totaux", level=2)
+    doc.add_paragraph(f"Go Between validés: {resultats.go_between_valides}")
+    doc.add_paragraph(f"RDV réalisés: {resultats.rdv_realises}")
+    doc.add_paragraph(f"RDV non réalisés: {resultats.rdv_non_realises}")
+
+    doc.add_heading("Statut des mises en relation", level=2)
+    ajouter_repartition(doc, resultats.statuts_mises, ["Statut", "Nombre"])
+
+    doc.add_paragraph(f"Taux de conversion Go Between (%): {resultats.taux_go_between}")
+    doc.add_paragraph(f"Taux de conversion RDV réalisés (%): {resultats.taux_rdv}")
+
+    doc.add_heading("Répartition trimestrielle des demandes", level=2)
+    ajouter_rollup(doc, resultats.rollups["Q"])
+
+    # Profils persos & Sociétés
+    doc.add_heading("Profils persos & Sociétés", level=1)
+    doc.add_paragraph(f"Nombre total d'entrepreneurs: {resultats.nb_entrepreneurs}")
+    doc.add_paragraph(f"Total profils persos: {resultats.profils_total}")
+
+    doc.add_heading("Statut profils persos", level=2)
+    ajouter_repartition(doc, resultats.statut_users, ["Statut", "Nombre"])
+
+    doc.add_heading("Statut profils sociétés", level=2)
+    ajouter_repartition(doc, resultats.statut_entreprises, ["Statut", "Nombre"])
+
+    # Complétion des profils
+    doc.add_heading("Complétion des profils", level=1)
+    doc.add_heading("Vue globale", level=2)
+    ajouter_repartition(doc, resultats.profil_personnel, ["Profil personnel", "Nombre"])
+    doc.add_paragraph()
+    ajouter_repartition(doc, resultats.profil_societes, ["Profil sociétés", "Nombre"])
+
+    doc.add_heading("Par CAR/SUM", level=2)
+    if pivot:
+        ajouter_tableau_croise(doc, resultats.par_car_sum, "CAR/SUM")
+    else:
+        ajouter_repartition(doc, resultats.par_car_sum, ["CAR/SUM", "Profil sociétés", "Nombre"])
+
+    doc.add_heading("Par Incubateur territorial", level=2)
+    if pivot:
+        ajouter_tableau_croise(doc, resultats.par_incubateur, "Incubateur territorial")
+    else:
+        ajouter_repartition(doc, resultats.par_incubateur, ["Incubateur territorial", "Profil sociétés", "Nombre"])
+
+    doc.add_heading("% de complétion sur les profils incubation individuelle", level=2)
+    ajouter_repartition(doc, resultats.completion_incubation_indiv, ["Profil sociétés", "%"])
+
+    doc_stream = io.BytesIO()
+    doc.save(doc_stream)
+    doc_stream.seek(0)
+    return doc_stream
+
+
+# --- Extract final (DOCX avec logo) ---
+# Version courte de l'extract, avec le logo et la date de calcul (app6.py)
+LOGO_EXTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo1.png")
+
+
+@mesure("rapport.docx")
+def generate_docx_final(resultats):
+    doc = Document()
+    doc.add_heading("Dashboard Marketplace & Incubateur - Extract", 0)
+
+    # Logo
+    if os.path.exists(LOGO_EXTRACT):
+        doc.add_picture(LOGO_EXTRACT)
+
+    doc.add_paragraph(f"Généré le {resultats.date_calcul.strftime('%d/%m/%Y')}")
+
+    # Datas globales
+    doc.add_heading("Datas globales", level=1)
+    doc.add_paragraph(f"Demandes de mise en relation: {resultats.demandes_total}")
+    doc.add_paragraph(f"Profils créés: {resultats.profils_total}")
+    doc.add_paragraph(f"Profils connectés sur le mois: {resultats.profils_connectes}")
+
+    # Marketplace
+    doc.add_heading("Marketplace", level=1)
+    doc.add_paragraph(f"Go Between validés: {resultats.go_between_valides}")
+    doc.add_paragraph(f"RDV réalisés: {resultats.rdv_realises}")
+    doc.add_paragraph(f"RDV non réalisés: {resultats.rdv_non_realises}")
+    doc.add_paragraph(f"Taux de conversion Go Between (%): {resultats.taux_go_between}")
+    doc.add_paragraph(f"Taux de conversion RDV réalisés (%): {resultats.taux_rdv}")
+
+    # Totaux trimestriels
+    doc.add_heading("Totaux trimestriels", level=1)
+    ajouter_rollup(doc, resultats.rollups["Q"])
+
+    # Répartitions
+    for serie, titre in [
+        (resultats.statut_users, "Statut des utilisateurs"),
+        (resultats.statut_entreprises, "Statut des entreprises"),
+        (resultats.profil_personnel, "Profil personnel Le Club"),
+        (resultats.profil_societes, "Profil sociétés Le Club"),
+    ]:
+        doc.add_heading(titre, level=1)
+        ajouter_repartition(doc, serie, [titre, "Nombre"])
+
+    doc_stream = io.BytesIO()
+    doc.save(doc_stream)
+    doc_stream.seek(0)
+    return doc_stream
+
+
+# --- Génération du PDF (fpdf2) ---
+# Mêmes sections que le DOCX ; les répartitions par CAR/SUM et par incubateur
+# sont des tableaux croisés (une ligne par territoire, une colonne par profil).
+TITRE_RAPPORT = "Dashboard Marketplace & Incubateur - Extract"
+
+
+# Police TrueType Unicode (’, œ, € des libellés et des données) : celle de
+# LECLUB_POLICE_PDF, sinon DejaVu Sans si elle est installée. Sans police
+# disponible, repli sur la Helvetica standard du PDF, limitée au latin-1.
+POLICES_PDF = [
+    os.environ.get("LECLUB_POLICE_PDF"),
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/Library/Fonts/DejaVuSans.ttf",
+    "C:/Windows/Fonts/DejaVuSans.ttf",
+]
+
+
+def police_unicode():
+    # (régulière, grasse) ; la régulière sert aussi de grasse à défaut
+    for chemin in POLICES_PDF:
+        if chemin and os.path.exists(chemin):
+            grasse = re.sub(r"\.ttf$", "-Bold.ttf", chemin, flags=re.IGNORECASE)
+            return chemin, grasse if os.path.exists(grasse) else chemin
+    return None
+
+
+def _latin1(valeur):
+    # Les polices standard du PDF sont en latin-1
+    return str(valeur).encode("latin-1", "replace").decode("latin-1")
+
+
+class _RapportPDF(FPDF):
+    def __init__(self):
+        super().__init__()
+        fichiers = police_unicode()
+        if fichiers:
+            self.add_font("rapport", "", fichiers[0])
+            self.add_font("rapport", "B", fichiers[1])
+            self.police, self._texte = "rapport", str
+        else:
+            self.police, self._texte = "helvetica", _latin1
+
+    def titre(self, texte, niveau=1):
+        self.set_font(self.police, "B", {0: 18, 1: 14, 2: 12}[niveau])
+        self.ln(2)
+        self.multi_cell(0, 8, self._texte(texte), new_x="LMARGIN", new_y="NEXT")
+        self.set_font(self.police, size=10)
+
+    def ligne(self, texte):
+        # cell (une ligne, sans césure) : bien plus rapide que multi_cell
+        self.cell(0, 5, self._texte(texte), new_x="LMARGIN", new_y="NEXT")
+
+    def lignes(self, serie, suffixe=""):
+        for valeur, count in serie.items():
+            self.ligne(f"{valeur}: {count}{suffixe}")
+
+    def _rangee(self, valeurs, largeurs, gras=False):
+        self.set_font(self.police, "B" if gras else "", 8)
+        for valeur, largeur in zip(valeurs, largeurs):
+            texte = self._texte(valeur)
+            while texte and self.get_string_width(texte) > largeur - 2:
+                texte = texte[:-1]
+            self.cell(largeur, 5, texte, border=1)
+        self.ln(5)
+
+    def grille(self, entete, lignes, largeur_premiere=80):
+        largeur_premiere = min(largeur_premiere, self.epw / 2)
+        largeurs = [largeur_premiere] + [(self.epw - largeur_premiere) / (len(entete) - 1)] * (len(entete) - 1)
+
+        self._rangee(entete, largeurs, gras=True)
+        for ligne in lignes:
+            if self.will_page_break(5):
+                self.add_page()
+                self._rangee(entete, largeurs, gras=True)
+            self._rangee(ligne, largeurs)
+        self.set_font(self.police, size=10)
+
+    def tableau(self, counts, libelle):
+        # counts : Série indexée (groupe, profil) -> tableau groupes x profils
+        if counts.empty:
+            return
+        croise = counts.unstack(fill_value=0)
+        lignes = [[groupe, *valeurs] for groupe, valeurs in zip(croise.index, croise.to_numpy().tolist())]
+        self.grille([libelle, *croise.columns], lignes)
+
+
+@mesure("rapport.pdf")
+def generate_pdf_metrics(resultats):
+    pdf = _RapportPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    pdf.titre(TITRE_RAPPORT, 0)
+
+    # Datas globales
+    pdf.titre("Datas globales")
+    pdf.ligne(f"Demandes de mise en relation: {resultats.demandes_total}")
+    pdf.ligne(f"Profils créés: {resultats.profils_total}")
+    pdf.ligne(f"Profils connectés sur le mois: {resultats.profils_connectes}")
+
+    # Marketplace
+    pdf.titre("Marketplace")
+    pdf.titre("Totaux", 2)
+    pdf.ligne(f"Go Between validés: {resultats.go_between_valides}")
+    pdf.ligne(f"RDV réalisés: {resultats.rdv_realises}")
+    pdf.ligne(f"RDV non réalisés: {resultats.rdv_non_realises}")
+
+    pdf.titre("Statut des mises en relation", 2)
+    pdf.lignes(resultats.statuts_mises)
+
+    pdf.ligne(f"Taux de conversion Go Between (%): {resultats.taux_go_between}")
+    pdf.ligne(f"Taux de conversion RDV réalisés (%): {resultats.taux_rdv}")
+
+    pdf.titre("Répartition trimestrielle des demandes", 2)
+    pdf.grille(*lignes_rollup(resultats.rollups["Q"]), largeur_premiere=25)
+
+    # Profils persos & Sociétés
+    pdf.titre("Profils persos & Sociétés")
+    pdf.ligne(f"Nombre total d'entrepreneurs: {resultats.nb_entrepreneurs}")
+    pdf.ligne(f"Total profils persos: {resultats.profils_total}")
+
+    pdf.titre("Statut profils persos", 2)
+    pdf.lignes(resultats.statut_users)
+
+    pdf.titre("Statut profils sociétés", 2)
+    pdf.lignes(resultats.statut_entreprises)
+
+    # Complétion des profils
+    pdf.titre("Complétion des profils")
+    pdf.titre("Vue globale", 2)
+    for val, count in resultats.profil_personnel.items():
+        pdf.ligne(f"{val} (personnel): {count}")
+    for val, count in resultats.profil_societes.items():
+        pdf.ligne(f"{val} (sociétés): {count}")
+
+    pdf.titre("Par CAR/SUM", 2)
+    pdf.tableau(resultats.par_car_sum, "CAR/SUM")
+
+    pdf.titre("Par Incubateur territorial", 2)
+    pdf.tableau(resultats.par_incubateur, "Incubateur territorial")
+
+    pdf.titre("% de complétion sur les profils incubation individuelle", 2)
+    pdf.lignes(resultats.completion_incubation_indiv, "%")
+
+    return io.BytesIO(pdf.output())
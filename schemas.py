@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from mesures import etape
+
+# --- Schémas typés des quatre fichiers ---
+# Type par colonne, appliqué une seule fois à l'ingestion :
+#   "categorie" : valeurs nettoyées (strip) puis converties en category
+#   "nombre"    : pd.to_numeric(errors="coerce")
+#   "date"      : pd.to_datetime(dayfirst=True, errors="coerce")
+#   "mois"      : pd.to_datetime(format="%Y-%m", errors="coerce")
+#   "texte"     : texte libre long, utilisé par aucun KPI : non chargé par la
+#                 lecture Excel élaguée (voir colonnes_utiles)
+#   None        : colonne laissée telle quelle (identifiants, texte court)
+SCHEMA_USERS = {
+    "#Id": None,
+    "Prénom": None,
+    "Nom": None,
+    "Inscrit depuis le": "date",
+    "Statut": "categorie",
+    "ID Unique": None,
+    "Date de dernière connexion": "date",
+}
+
+SCHEMA_ENTREPRISES = {
+    "Id": None,
+    "Nom": None,
+    "Date de création": "date",
+    "Date d'ouverture": "date",
+    "Incubateurs": "categorie",
+    "À propos": "texte",
+    "Missions": "texte",
+    "Adresse": None,
+    "Ville": "categorie",
+    "Code postal": None,
+    "Téléphone": None,
+    "Email": None,
+    "Effectifs": "categorie",
+    "Linkedin": None,
+    "Site web": None,
+    "Équipe": "texte",
+    "Statut": "categorie",
+}
+
+SCHEMA_MISES = {
+    "Utilisateur": None,
+    "goBetween": "categorie",
+    "Statut des mises en relation à date": "categorie",
+    "Dates simples": "mois",
+    "Demande de mise en relation": None,
+    "RDV réalisés": "nombre",
+    "Taux de conversion goBetween": "nombre",
+    "Taux de conversion RDV réalisé": "nombre",
+    "Go between validé": "categorie",
+    "Go between refusé": "categorie",
+    "Rdv non réalisé": "nombre",
+}
+
+SCHEMA_GLOBALE = {
+    "Name": None,
+    "Nom": None,
+    "Projet": None,
+    "CAR/SUM (territorial)": "categorie",
+    "Incubateur territorial": "categorie",
+    "Statut d'incubation": "categorie",
+    "Poste et/ou fonction": "categorie",
+    "Profil personnel Le Club": "categorie",
+    "Profil sociétés Le Club": "categorie",
+    "Partenaires Marketplace": "categorie",
+    "Date dernière connexion Le Club": "date",
+}
+
+# --- Colonnes attendues ---
+cols_users = list(SCHEMA_USERS)
+cols_entreprises = list(SCHEMA_ENTREPRISES)
+cols_mises = list(SCHEMA_MISES)
+cols_globale = list(SCHEMA_GLOBALE)
+
+SCHEMAS_ROLES = {
+    "users": SCHEMA_USERS,
+    "entreprises": SCHEMA_ENTREPRISES,
+    "mises": SCHEMA_MISES,
+    "globale": SCHEMA_GLOBALE,
+}
+
+
+def colonnes_utiles(schema):
+    # Colonnes à charger et à vérifier : toutes sauf le texte libre
+    return [col for col, type_colonne in schema.items() if type_colonne != "texte"]
+
+
+def projeter(schema, colonnes):
+    # Sous-schéma restreint à colonnes, dans l'ordre du schéma : l'ingestion ne
+    # charge et ne vérifie que ces colonnes
+    return {col: type_colonne for col, type_colonne in schema.items() if col in colonnes}
+
+
+def categorie_nettoyee(serie):
+    # Le strip se fait sur les catégories distinctes puis on ré-indexe les codes,
+    # sans repasser sur chaque ligne en tant que chaîne
+    cat = serie.astype("category")
+    categories = cat.cat.categories
+    nettoyees = pd.Index(categories.astype(str).str.strip())
+    if nettoyees.equals(pd.Index(categories)):
+        return cat
+    uniques = pd.Index(nettoyees.unique())
+    remap = uniques.get_indexer(nettoyees)
+    codes = cat.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, uniques), index=serie.index, name=serie.name)
+
+
+def convertir_colonne(serie, type_colonne):
+    if type_colonne == "categorie":
+        return categorie_nettoyee(serie)
+    if type_colonne == "nombre":
+        return pd.to_numeric(serie, errors="coerce")
+    if type_colonne == "date":
+        return pd.to_datetime(serie, dayfirst=True, errors="coerce")
+    if type_colonne == "mois":
+        return pd.to_datetime(serie, format="%Y-%m", errors="coerce")
+    return serie
+
+
+def compter_valeurs(objet, **kwargs):
+    # value_counts sur une colonne catégorielle (ou un groupby) liste aussi les
+    # catégories absentes avec un compte nul : on les retire
+    counts = objet.value_counts(**kwargs)
+    return counts[counts > 0]
+
+
+def appliquer_schema(df, schema):
+    conversions = {}
+    for col, type_colonne in schema.items():
+        if type_colonne not in (None, "texte") and col in df.columns:
+            with etape(f"typage.{type_colonne}", col):
+                conversions[col] = convertir_colonne(df[col], type_colonne)
+    if not conversions:
+        return df
+    return df.assign(**conversions)
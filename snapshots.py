@@ -0,0 +1,125 @@
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# --- Snapshots locaux des jeux de données ingérés ---
+# Activés en définissant LECLUB_SNAPSHOT_DIR. Chaque DataFrame parsé et typé est
+# écrit une fois, sous son empreinte (SHA du contenu + schéma) ; les chargements
+# suivants du même fichier relisent le snapshot au lieu de re-parser le CSV/XLSX.
+# Format "arrow" (IPC, mappé en mémoire) par défaut, ou "parquet".
+# Chaque nouvelle version d'un fichier ajoute un snapshot : après chaque
+# écriture, ceux inutilisés depuis SNAPSHOT_MAX_JOURS sont supprimés, puis les
+# moins récemment utilisés jusqu'à repasser sous SNAPSHOT_MAX_OCTETS.
+SNAPSHOT_DIR = os.environ.get("LECLUB_SNAPSHOT_DIR")
+SNAPSHOT_FORMAT = os.environ.get("LECLUB_SNAPSHOT_FORMAT", "arrow")
+SNAPSHOT_MAX_JOURS = float(os.environ.get("LECLUB_SNAPSHOT_MAX_JOURS", "30"))
+SNAPSHOT_MAX_OCTETS = int(os.environ.get("LECLUB_SNAPSHOT_MAX_OCTETS", str(2 * 1024**3)))
+
+EXTENSIONS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+
+def actif():
+    if not SNAPSHOT_DIR:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def chemin_snapshot(empreinte, format_snapshot=None):
+    format_snapshot = format_snapshot or SNAPSHOT_FORMAT
+    return os.path.join(SNAPSHOT_DIR, empreinte + EXTENSIONS[format_snapshot])
+
+
+def existe(empreinte):
+    return any(os.path.exists(chemin_snapshot(empreinte, format_snapshot)) for format_snapshot in EXTENSIONS)
+
+
+def charger(empreinte):
+    # On accepte les deux formats, quel que soit le format d'écriture courant
+    for format_snapshot in EXTENSIONS:
+        chemin = chemin_snapshot(empreinte, format_snapshot)
+        if not os.path.exists(chemin):
+            continue
+        try:
+            if format_snapshot == "arrow":
+                import pyarrow as pa
+
+                with pa.memory_map(chemin, "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                df = table.to_pandas()
+            else:
+                df = pd.read_parquet(chemin, memory_map=True)
+        except Exception:
+            # Snapshot illisible (écriture interrompue, version de pyarrow) : on
+            # retombe sur le parsing du fichier d'origine
+            continue
+        # Date d'utilisation, pour le nettoyage
+        try:
+            os.utime(chemin)
+        except OSError:
+            pass
+        df.attrs["ingestion"] = {"moteur": "snapshot", "format": format_snapshot, "chemin": chemin}
+        return df
+    return None
+
+
+def sauver(empreinte, df):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    chemin = chemin_snapshot(empreinte)
+    # Écriture dans un fichier temporaire puis renommage atomique, pour qu'une
+    # session concurrente ne lise jamais un snapshot partiel
+    fd, temporaire = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        if SNAPSHOT_FORMAT == "arrow":
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(temporaire, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            df.to_parquet(temporaire, index=False)
+        os.replace(temporaire, chemin)
+    except Exception:
+        # Colonnes object de types mélangés non convertibles en Arrow, disque
+        # plein... le snapshot n'est qu'une optimisation
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        return False
+    nettoyer(garder=chemin)
+    return True
+
+
+def nettoyer(garder=None):
+    # Supprime les snapshots trop anciens puis les moins récemment utilisés
+    # au-delà du budget disque ; garder : snapshot qui vient d'être écrit
+    limite = time.time() - SNAPSHOT_MAX_JOURS * 86400
+    fichiers = []
+    for entree in os.scandir(SNAPSHOT_DIR):
+        if not entree.name.endswith(tuple(EXTENSIONS.values())) or entree.path == garder:
+            continue
+        try:
+            stat = entree.stat()
+        except OSError:
+            continue
+        fichiers.append((stat.st_mtime, stat.st_size, entree.path))
+    total = sum(taille for _, taille, _ in fichiers)
+    if garder and os.path.exists(garder):
+        total += os.path.getsize(garder)
+
+    for mtime, taille, chemin in sorted(fichiers):
+        if mtime >= limite and total <= SNAPSHOT_MAX_OCTETS:
+            break
+        try:
+            os.remove(chemin)
+        except FileNotFoundError:
+            pass                        # déjà supprimé par une autre session
+        except OSError:
+            continue
+        total -= taille
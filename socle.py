@@ -0,0 +1,155 @@
+import os
+import runpy
+from dataclasses import dataclass
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from dossier import DOSSIER, INTERVALLE, scanner, versions
+from incremental import agregats_historique, charger_historique_df
+from ingestion import MULTI_TENANT, charger_dataframe_complet, lire_fichiers_safe, panneau_cache, signaler
+from jointure import COLONNES_JOINTURE
+from kpis import cle_donnees, kpis_memoises, schema_kpis
+from mesures import DEBUG, panneau_mesures
+from schemas import SCHEMA_GLOBALE
+
+# --- Socle commun des dashboards ---
+# Upload, lecture et KPIs partagés par toutes les vues de vues/, qu'elles soient
+# ouvertes par dashboard.py (multipage) ou par les scripts app*.py (une page
+# fixe). Ce module n'importe ni Plotly Express, ni python-docx/fpdf2, ni
+# st_aggrid : chaque vue importe les siens, à son premier affichage.
+RACINE = os.path.dirname(os.path.abspath(__file__))
+COLONNE_CONNEXION_GLOBALE = "Date dernière connexion Le Club"
+# Colonnes lues en plus des KPIs pour l'explorateur (activité des profils) ; les
+# lire pour toutes les vues évite de relire les fichiers en changeant de page
+COLONNES_ACTIVITE = {"globale": [COLONNE_CONNEXION_GLOBALE, "CAR/SUM (territorial)"]}
+CLE_SESSION = "socle-donnees"
+LIBELLES_ROLES = {
+    "users": "Noms persos",
+    "entreprises": "Entreprises données",
+    "mises": "Historique des mises en relation",
+    "globale": "Base globale projet",
+}
+
+
+@dataclass(frozen=True)
+class Donnees:
+    users: pd.DataFrame
+    entreprises: pd.DataFrame
+    mises: pd.DataFrame
+    globale: pd.DataFrame
+    marketplace: object = None      # AgregatsMarketplace de l'historique, si tenus à jour
+
+    @property
+    def completes(self):
+        return not any(df.empty for df in (self.users, self.entreprises, self.mises, self.globale))
+
+    def cle(self):
+        return cle_donnees(self.users, self.entreprises, self.mises, self.globale)
+
+    def resultats(self):
+        return kpis_memoises(
+            self.users, self.entreprises, self.mises, self.globale, marketplace=self.marketplace
+        )
+
+
+def uploaders():
+    # Fichiers des quatre rôles : dossier surveillé s'il est configuré
+    # (LECLUB_DOSSIER), sinon uploads de la session
+    if DOSSIER and st.sidebar.radio("Source des données", ["Dossier partagé", "Upload"], horizontal=True) == "Dossier partagé":
+        return fichiers_dossier()
+    st.sidebar.header("Uploader les fichiers")
+    return tuple(st.sidebar.file_uploader(libelle, type=["csv","xlsx"]) for libelle in LIBELLES_ROLES.values())
+
+
+# --- Dossier de données surveillé ---
+@st.fragment(run_every=INTERVALLE)
+def _surveiller(courantes):
+    # Seul ce fragment est réexécuté à chaque intervalle ; le dashboard n'est
+    # relancé que si un fichier a changé de contenu
+    try:
+        if versions(scanner()) != courantes:
+            st.rerun()
+    except OSError:
+        pass
+
+
+def fichiers_dossier():
+    st.sidebar.header("Dossier de données")
+    st.sidebar.caption(DOSSIER)
+    try:
+        fichiers = scanner()
+    except OSError as e:
+        signaler(f"Dossier de données illisible : {e}")
+        fichiers = {}
+    for role, libelle in LIBELLES_ROLES.items():
+        fichier = fichiers.get(role)
+        if fichier is None:
+            st.sidebar.caption(f"{libelle} : aucun fichier")
+        else:
+            date = datetime.fromtimestamp(fichier.mtime_ns / 1e9)
+            st.sidebar.caption(f"{libelle} : {fichier.name} ({date:%d/%m/%Y %H:%M})")
+    with st.sidebar:
+        _surveiller(versions(fichiers))
+    return tuple(fichiers.get(role) for role in LIBELLES_ROLES)
+
+
+def charger(fichiers, globale_complete=False):
+    # Lecture, à chaque exécution de dashboard.py avant la vue ;
+    # globale_complete : toutes les colonnes de la base globale (explorateur)
+    file_users, file_entreprises, file_mises_relation, file_base_globale = fichiers
+    if globale_complete:
+        demande_globale = (file_base_globale, SCHEMA_GLOBALE, charger_dataframe_complet)
+    else:
+        demande_globale = (file_base_globale, schema_kpis("globale", COLONNES_JOINTURE, COLONNES_ACTIVITE))
+    df_users, df_entreprises, df_mises, df_globale = lire_fichiers_safe([
+        (file_users, schema_kpis("users")),
+        (file_entreprises, schema_kpis("entreprises")),
+        (file_mises_relation, schema_kpis("mises", COLONNES_JOINTURE), charger_historique_df),
+        demande_globale,
+    ])
+    donnees = Donnees(df_users, df_entreprises, df_mises, df_globale, agregats_historique(df_mises))
+    st.session_state[CLE_SESSION] = donnees
+    return donnees
+
+
+def donnees_chargees():
+    # Pour les vues : les données lues par dashboard.py à cette exécution
+    return st.session_state[CLE_SESSION]
+
+
+# --- Exécution d'une page ---
+def executer(afficher, explorateur=False,
+             message="Veuillez uploader tous les fichiers correctement pour générer les KPIs."):
+    # afficher : rendu de la page une fois les données lues (page.run de
+    # st.navigation, ou vues() pour les scripts app*.py) ; explorateur : propose
+    # le chargement complet de la base globale ; message : si un fichier manque
+    fichiers = uploaders()
+    # L'explorateur n'affiche par défaut que les colonnes lues pour les vues ; le
+    # chargement complet de la base globale est à la demande
+    globale_complete = explorateur and st.sidebar.checkbox(
+        "Explorateur : charger toutes les colonnes de la base globale"
+    )
+    donnees = charger(fichiers, globale_complete)
+
+    if donnees.completes:
+        afficher()
+    else:
+        st.info(message)
+
+    # Après la vue : les mémos qu'elle a remplis sont comptés
+    if MULTI_TENANT:
+        panneau_cache()
+
+    if DEBUG:
+        panneau_mesures()
+
+
+def vues(*chemins, **variables):
+    # Pour les scripts app*.py : les vues données, à la suite, dans la même page ;
+    # variables : globales passées aux vues (ex. extracts de vues/extracts.py)
+    def afficher():
+        for chemin in chemins:
+            runpy.run_path(os.path.join(RACINE, chemin), init_globals=variables, run_name="__main__")
+    return afficher
@@ -0,0 +1,100 @@
+import os
+
+import pandas as pd
+
+import ingestion
+from kpis import COLONNES_MARKETPLACE, AgregatsMarketplace
+from schemas import SCHEMA_MISES, appliquer_schema
+
+# --- Lecture par blocs de l'historique des mises en relation ---
+# Pour les exports plus gros que la mémoire disponible : le fichier est lu bloc par
+# bloc (TAILLE_BLOC lignes, colonnes Marketplace uniquement) et chaque bloc est
+# combiné aux AgregatsMarketplace puis libéré. Les résultats sont ceux du
+# chargement complet, puisque c'est le même code d'agrégation.
+TAILLE_BLOC = 100_000
+
+
+def _ouvrir(source):
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb"), True
+    return source, False
+
+
+def _nom(source):
+    return os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+
+
+def _blocs_octets(fichier):
+    fichier.seek(0)
+    while True:
+        bloc = fichier.read(ingestion.ECHANTILLON_OCTETS)
+        if not bloc:
+            return
+        yield bloc
+
+
+def _blocs_csv(fichier, colonnes, taille_bloc):
+    encodage = ingestion.detecter_encodage_blocs(_blocs_octets(fichier))
+    fichier.seek(0)
+    echantillon = fichier.read(ingestion.ECHANTILLON_OCTETS)
+    separateur = ingestion.detecter_separateur(echantillon.decode(encodage, errors="ignore"))
+
+    fichier.seek(0)
+    lecteur = pd.read_csv(
+        fichier,
+        encoding=encodage,
+        sep=separateur,
+        engine="c",
+        # Les noms de colonnes sont nettoyés (strip) comme à l'ingestion complète
+        usecols=lambda col: col.strip() in colonnes,
+        chunksize=taille_bloc,
+    )
+    with lecteur:
+        for bloc in lecteur:
+            bloc.columns = bloc.columns.str.strip()
+            yield bloc
+
+
+def _blocs_xlsx(fichier, colonnes, taille_bloc):
+    import excel
+
+    # Même règle que l'ingestion complète : première feuille, en-tête sur la
+    # première ligne non vide ; seules les colonnes demandées sont décodées
+    yield from excel.blocs(fichier, colonnes, taille_bloc)
+
+
+def lire_par_blocs(source, colonnes=None, schema=SCHEMA_MISES, taille_bloc=TAILLE_BLOC):
+    # Générateur de DataFrames typés d'au plus taille_bloc lignes.
+    # source : chemin ou fichier binaire (.csv ou .xlsx). Lève IngestionError.
+    colonnes = list(colonnes or COLONNES_MARKETPLACE)
+    nom = _nom(source)
+    if nom.endswith(".csv"):
+        lecteur_blocs = _blocs_csv
+    elif nom.endswith(".xlsx"):
+        lecteur_blocs = _blocs_xlsx
+    else:
+        raise ingestion.IngestionError(f"Format de fichier non supporté : {nom}")
+
+    schema_colonnes = {col: schema.get(col) for col in colonnes}
+    fichier, a_fermer = _ouvrir(source)
+    try:
+        premier = True
+        for bloc in lecteur_blocs(fichier, colonnes, taille_bloc):
+            if premier:
+                missing_cols = ingestion.colonnes_manquantes(bloc, colonnes)
+                if missing_cols:
+                    raise ingestion.IngestionError(f"Colonnes manquantes dans {nom} : {missing_cols}")
+                premier = False
+            yield appliquer_schema(bloc, schema_colonnes)
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        raise ingestion.IngestionError(f"Impossible de lire le fichier {nom} : {e}")
+    finally:
+        if a_fermer:
+            fichier.close()
+
+
+def agreger_marketplace(source, taille_bloc=TAILLE_BLOC):
+    agregats = AgregatsMarketplace()
+    for bloc in lire_par_blocs(source, taille_bloc=taille_bloc):
+        agregats.ajouter(bloc)
+    return agregats
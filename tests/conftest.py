@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.donnees_synthetiques import generer  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def jeux():
+    return generer(3000, graine=1)
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from connexions import IndexConnexions
+from kpis import COLONNE_CONNEXION
+from schemas import SCHEMA_GLOBALE, SCHEMA_USERS, appliquer_schema
+from socle import COLONNE_CONNEXION_GLOBALE
+
+TODAY = pd.Timestamp("2026-10-18 15:30")
+
+
+def _dans(dates, debut=None, fin=None):
+    # Parcours booléen remplacé par l'index
+    retenu = dates.notna()
+    if debut is not None:
+        retenu &= dates >= debut
+    if fin is not None:
+        retenu &= dates <= fin
+    return retenu
+
+
+@pytest.fixture
+def df_users(jeux):
+    df = appliquer_schema(jeux["users"], SCHEMA_USERS).copy()
+    df.loc[df.index[::9], COLONNE_CONNEXION] = pd.NaT
+    return df
+
+
+@pytest.fixture
+def df_globale(jeux):
+    df = appliquer_schema(jeux["globale"], SCHEMA_GLOBALE).copy()
+    df.loc[df.index[::5], COLONNE_CONNEXION_GLOBALE] = pd.NaT
+    df.loc[df.index[::8], "CAR/SUM (territorial)"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("jours", [0, 7, 30, 90, 10_000])
+def test_actifs_sur_identique_au_filtre(df_users, jours):
+    index = IndexConnexions.depuis(df_users, COLONNE_CONNEXION)
+    month_ago = TODAY - pd.Timedelta(days=jours)
+
+    assert index.actifs_sur(jours, today=TODAY) == int((df_users[COLONNE_CONNEXION] >= month_ago).sum())
+
+
+def test_fenetres_bornes_incluses(df_users):
+    dates = df_users[COLONNE_CONNEXION]
+    index = IndexConnexions.depuis(df_users, COLONNE_CONNEXION)
+    # Bornes tombant exactement sur des dates présentes, bornes inversées, plage ouverte
+    presentes = dates.dropna().sort_values()
+    fenetres = [
+        (None, None),
+        (presentes.iloc[100], None),
+        (None, presentes.iloc[100]),
+        (presentes.iloc[100], presentes.iloc[500]),
+        (presentes.iloc[500], presentes.iloc[100]),
+        (pd.Timestamp("2030-01-01"), None),
+    ]
+
+    for debut, fin in fenetres:
+        assert index.actifs(debut, fin) == int(_dans(dates, debut, fin).sum())
+
+
+def test_actifs_par_groupe_identique_au_groupby(df_globale):
+    dates = df_globale[COLONNE_CONNEXION_GLOBALE]
+    groupe = df_globale["CAR/SUM (territorial)"]
+    index = IndexConnexions.depuis(df_globale, COLONNE_CONNEXION_GLOBALE, "CAR/SUM (territorial)")
+    debut = TODAY - pd.Timedelta(days=90)
+
+    obtenu = index.actifs_par_groupe(debut=debut)
+    attendu = _dans(dates, debut).groupby(groupe, observed=True).sum()
+
+    pd.testing.assert_series_equal(
+        obtenu.sort_index(), attendu.astype("int64").sort_index(),
+        check_names=False, check_index_type=False, check_categorical=False,
+    )
+    assert obtenu.index.name == "CAR/SUM (territorial)"
+
+
+def test_actifs_mensuels_identique_au_filtre(df_users):
+    dates = df_users[COLONNE_CONNEXION]
+    mensuels = IndexConnexions.depuis(df_users, COLONNE_CONNEXION).actifs_mensuels()
+
+    assert mensuels.index.min() == dates.min().to_period("M")
+    assert mensuels.index.max() == dates.max().to_period("M")
+    for mois, actifs in mensuels.items():
+        assert actifs == int((dates >= mois.start_time).sum())
+
+
+@pytest.mark.parametrize("dates", [[], [pd.NaT, pd.NaT]])
+def test_sans_date(dates):
+    df = pd.DataFrame({
+        COLONNE_CONNEXION: pd.Series(dates, dtype="datetime64[ns]"),
+        "Groupe": pd.Series(["a"] * len(dates), dtype="category"),
+    })
+    index = IndexConnexions.depuis(df, COLONNE_CONNEXION, "Groupe")
+
+    assert index.actifs() == 0
+    assert index.actifs_sur(30, today=TODAY) == 0
+    assert index.actifs_mensuels().empty
+    assert (index.actifs_par_groupe() == 0).all()
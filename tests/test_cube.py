@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import CubeGlobale, DIMENSIONS_GLOBALE
+from schemas import SCHEMA_GLOBALE, appliquer_schema, compter_valeurs
+
+
+@pytest.fixture
+def df_globale(jeux):
+    df = appliquer_schema(jeux["globale"], SCHEMA_GLOBALE)
+    # Quelques profils et territoires manquants, une catégorie jamais utilisée
+    df = df.copy()
+    df.loc[df.index[::7], "Profil sociétés Le Club"] = np.nan
+    df.loc[df.index[::11], "CAR/SUM (territorial)"] = np.nan
+    df["Profil personnel Le Club"] = df["Profil personnel Le Club"].cat.add_categories(["Jamais"])
+    return df
+
+
+def _meme_comptage(obtenu, attendu):
+    # Ordre des ex æquo libre ; le comptage lui-même doit être identique
+    pd.testing.assert_series_equal(
+        obtenu.sort_index(), attendu.sort_index(), check_names=False, check_index_type=False,
+        check_categorical=False,
+    )
+
+
+def _decroissant_par_groupe(counts, par):
+    for _, groupe in counts.groupby(level=par, observed=True):
+        assert groupe.is_monotonic_decreasing
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS_GLOBALE)
+def test_compter_identique_a_value_counts(df_globale, dimension):
+    obtenu = CubeGlobale.depuis(df_globale).compter(dimension)
+
+    _meme_comptage(obtenu, compter_valeurs(df_globale[dimension]))
+    assert obtenu.is_monotonic_decreasing
+    assert "Jamais" not in obtenu.index
+
+
+def test_compter_par_groupe_identique_au_groupby(df_globale):
+    obtenu = CubeGlobale.depuis(df_globale).compter("Profil sociétés Le Club", par="CAR/SUM (territorial)")
+    attendu = compter_valeurs(df_globale.groupby("CAR/SUM (territorial)", observed=True)["Profil sociétés Le Club"])
+
+    _meme_comptage(obtenu, attendu)
+    _decroissant_par_groupe(obtenu, "CAR/SUM (territorial)")
+    assert not obtenu.index.to_frame().isna().any().any()
+
+
+def test_compter_normalise_sur_un_filtre(df_globale):
+    cube = CubeGlobale.depuis(df_globale)
+    incubation_indiv = df_globale[df_globale["Statut d'incubation"] == "Incubation individuelle"]
+
+    obtenu = cube.filtrer(**{"Statut d'incubation": "Incubation individuelle"}).compter(
+        "Profil sociétés Le Club", normalize=True
+    )
+    attendu = compter_valeurs(incubation_indiv["Profil sociétés Le Club"], normalize=True)
+
+    _meme_comptage(obtenu, attendu)
+    assert obtenu.sum() == pytest.approx(1)
+
+
+def test_filtre_sur_plusieurs_valeurs(df_globale):
+    cube = CubeGlobale.depuis(df_globale)
+    statuts = df_globale["Statut d'incubation"].dropna().unique()[:2].tolist()
+
+    filtre = cube.filtrer(**{"Statut d'incubation": statuts})
+
+    assert filtre.total() == int(df_globale["Statut d'incubation"].isin(statuts).sum())
+    _meme_comptage(
+        filtre.compter("Incubateur territorial"),
+        compter_valeurs(df_globale[df_globale["Statut d'incubation"].isin(statuts)]["Incubateur territorial"]),
+    )
+
+
+def test_filtre_vide(df_globale):
+    cube = CubeGlobale.depuis(df_globale)
+
+    vide = cube.filtrer(**{"Statut d'incubation": "Inexistant"})
+
+    assert vide.total() == 0
+    assert vide.compter("Profil sociétés Le Club").empty
+    assert vide.compter("Profil sociétés Le Club", par="CAR/SUM (territorial)").empty
+    assert cube.filtrer(**{"Statut d'incubation": []}).total() == 0
+
+
+def test_total_compte_les_lignes_manquantes(df_globale):
+    assert CubeGlobale.depuis(df_globale).total() == len(df_globale)
@@ -0,0 +1,64 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import excel
+
+
+def _classeur():
+    # Lignes vides avant l'en-tête et entre les données, colonnes non demandées
+    classeur = Workbook()
+    feuille = classeur.active
+    feuille.append([])
+    feuille.append(["Utilisateur", "Commentaire", "Date", "RDV réalisés"])
+    feuille.append(["Alice", "texte libre", datetime(2024, 1, 5), 2])
+    feuille.append([])
+    feuille.append(["Bob", None, datetime(2024, 2, 9), None])
+    feuille.append([None, "seul commentaire", None, None])
+    feuille.append(["0102030405", "x", datetime(2024, 3, 1), 1])
+    feuille.append([])
+    tampon = io.BytesIO()
+    classeur.save(tampon)
+    return tampon.getvalue()
+
+
+@pytest.fixture
+def sans_api_interne(monkeypatch):
+    # openpyxl sans WorkSheetParser : lecture par iter_rows
+    monkeypatch.setattr(excel, "WorkSheetParser", None)
+
+
+@pytest.mark.parametrize("colonnes", [None, ["Utilisateur", "Date", "RDV réalisés"]])
+def test_lire_repli_identique(colonnes, monkeypatch):
+    content = _classeur()
+    df_elague, infos_elague = excel.lire(content, colonnes)
+    monkeypatch.setattr(excel, "WorkSheetParser", None)
+    df_repli, infos_repli = excel.lire(content, colonnes)
+
+    pd.testing.assert_frame_equal(df_repli, df_elague)
+    assert infos_repli == infos_elague
+    assert len(df_elague) == 5
+
+
+def test_blocs_repli_identiques(sans_api_interne):
+    content = _classeur()
+    colonnes = ["Utilisateur", "RDV réalisés"]
+    attendu, _ = excel.lire(content, colonnes)
+    blocs = list(excel.blocs(io.BytesIO(content), colonnes, 2))
+
+    assert [len(bloc) for bloc in blocs] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(blocs, ignore_index=True).infer_objects(), attendu)
+
+
+def test_repli_si_signature_du_parseur_differente(monkeypatch):
+    content = _classeur()
+    attendu, _ = excel.lire(content)
+
+    def parseur_incompatible(*args, **kwargs):
+        raise TypeError("argument inattendu")
+    monkeypatch.setattr(excel, "_ParseurColonnes", parseur_incompatible)
+
+    pd.testing.assert_frame_equal(excel.lire(content)[0], attendu)
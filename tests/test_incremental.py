@@ -0,0 +1,138 @@
+import pandas as pd
+import pytest
+
+import incremental
+import ingestion
+import snapshots
+from jointure import COLONNES_JOINTURE
+from kpis import schema_kpis
+
+
+def _csv(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def _decouper(content, lignes):
+    # (début du fichier : en-tête + `lignes` lignes, fichier complet)
+    morceaux = content.splitlines(keepends=True)
+    return b"".join(morceaux[:lignes + 1]), content
+
+
+def _comparable(agregats):
+    valeurs = agregats.vers_dict()
+    valeurs["mois"] = {mois: pytest.approx(cumul) for mois, cumul in valeurs["mois"].items()}
+    return {cle: pytest.approx(v) if isinstance(v, float) else v for cle, v in valeurs.items()}
+
+
+def test_delta_identique_au_chargement_complet(jeux):
+    debut, complet = _decouper(_csv(jeux["mises"]), 1000)
+    schema = schema_kpis("mises")
+
+    incremental.charger_historique("delta.csv", debut, schema)
+    df_delta, agregats_delta, infos = incremental.charger_historique("delta.csv", complet, schema)
+    df_complet, agregats_complet, _ = incremental.charger_historique("complet.csv", complet, schema)
+
+    assert infos == {"mode": "delta", "lignes_ajoutees": 2000}
+    pd.testing.assert_frame_equal(
+        df_delta.astype(object), df_complet.astype(object), check_categorical=False
+    )
+    assert agregats_delta.vers_dict() == _comparable(agregats_complet)
+
+
+def test_delta_ne_modifie_pas_les_agregats_precedents(jeux):
+    debut, complet = _decouper(_csv(jeux["mises"]), 1000)
+    schema = schema_kpis("mises")
+
+    _, precedents, _ = incremental.charger_historique("copie.csv", debut, schema)
+    avant = precedents.vers_dict()
+    avant = {cle: (dict(v) if isinstance(v, dict) else v) for cle, v in avant.items()}
+    avant["mois"] = {mois: list(cumul) for mois, cumul in avant["mois"].items()}
+
+    _, suivants, _ = incremental.charger_historique("copie.csv", complet, schema)
+
+    assert suivants is not precedents
+    assert precedents.vers_dict() == avant
+    assert sum(precedents.statuts.values()) == precedents.nb_demandes == 1000
+
+
+def test_schema_different_recharge_les_colonnes(jeux):
+    content = _csv(jeux["mises"])
+
+    incremental.charger_historique("schemas.csv", content, schema_kpis("mises"))
+    df, _, infos = incremental.charger_historique(
+        "schemas.csv", content, schema_kpis("mises", COLONNES_JOINTURE)
+    )
+
+    assert infos["mode"] == "complet"
+    assert "Utilisateur" in df.columns
+
+
+def test_fichiers_de_meme_nom_gardent_chacun_leur_etat(jeux):
+    mises = jeux["mises"]
+    equipe_a, equipe_b = _csv(mises.iloc[:1500]), _csv(mises.iloc[1500:])
+    schema = schema_kpis("mises")
+
+    modes = [
+        incremental.charger_historique("Historique des mises en relation.csv", content, schema)[2]["mode"]
+        for content in [equipe_a, equipe_b, equipe_a, equipe_b, equipe_a]
+    ]
+
+    assert modes == ["complet", "complet", "inchange", "inchange", "inchange"]
+
+
+def test_etat_sans_dataframe_hors_cache(jeux):
+    debut, complet = _decouper(_csv(jeux["mises"]), 1000)
+    schema = schema_kpis("mises")
+
+    incremental.charger_historique("evince.csv", debut, schema)
+    # Le DataFrame n'est gardé que par le cache d'ingestion : évincé, le
+    # fichier suivant est rechargé en entier
+    ingestion.cache.clear()
+    df, agregats, infos = incremental.charger_historique("evince.csv", complet, schema)
+
+    assert infos["mode"] == "complet"
+    assert len(df) == agregats.nb_demandes == 3000
+    assert all(not hasattr(etat, "df") for etat in incremental._etats.values())
+
+
+def test_nombre_d_etats_borne(jeux, monkeypatch):
+    monkeypatch.setattr(incremental._etats, "taille", 2)
+    content = _csv(jeux["mises"].iloc[:100])
+    for i in range(4):
+        incremental.charger_historique(f"borne-{i}.csv", content, schema_kpis("mises"))
+
+    assert len(incremental._etats) == 2
+
+
+@pytest.fixture
+def snapshots_actifs(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    ecritures = []
+    sauver = snapshots.sauver
+    monkeypatch.setattr(snapshots, "sauver", lambda empreinte, df: ecritures.append(empreinte) or sauver(empreinte, df))
+    return ecritures
+
+
+def test_chargement_complet_ecrit_un_seul_snapshot(jeux, snapshots_actifs):
+    debut, complet = _decouper(_csv(jeux["mises"]), 1000)
+    schema = schema_kpis("mises")
+
+    incremental.charger_historique("unique.csv", debut, schema)
+    assert len(snapshots_actifs) == 1
+    incremental.charger_historique("unique.csv", complet, schema)
+    assert len(snapshots_actifs) == 2
+
+
+def test_etat_disque_par_schema(jeux, snapshots_actifs, monkeypatch):
+    debut, complet = _decouper(_csv(jeux["mises"]), 1000)
+    schemas = [schema_kpis("mises"), schema_kpis("mises", COLONNES_JOINTURE)]
+    for schema in schemas:
+        incremental.charger_historique("disque.csv", debut, schema)
+
+    # Redémarrage : seuls les états enregistrés sur disque restent
+    incremental._etats.clear()
+    ingestion.cache.clear()
+    modes = [incremental.charger_historique("disque.csv", complet, schema)[2]["mode"] for schema in schemas]
+
+    assert modes == ["delta", "delta"]
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from grille import masque
+from jointure import COLONNE_STATUT, IndexDemandes
+from schemas import SCHEMA_GLOBALE, SCHEMA_MISES, appliquer_schema, compter_valeurs
+
+
+def _attendu(df_mises, df_globale, retenu):
+    # Chemin remplacé par l'index : isin sur tout l'historique
+    df_mises_filtered = df_mises[df_mises["Utilisateur"].isin(df_globale["Name"][retenu])]
+    return len(df_mises_filtered), compter_valeurs(df_mises_filtered[COLONNE_STATUT])
+
+
+def _verifier(index, df_mises, df_globale, retenu):
+    demandes, statuts = _attendu(df_mises, df_globale, retenu)
+    assert index.demandes(retenu) == demandes
+    pd.testing.assert_series_equal(
+        index.statuts_demandes(retenu).sort_index(), statuts.sort_index(), check_index_type=False
+    )
+
+
+@pytest.fixture
+def donnees(jeux):
+    df_mises = appliquer_schema(jeux["mises"], SCHEMA_MISES).copy()
+    df_mises.loc[df_mises.index[::13], COLONNE_STATUT] = np.nan
+    df_globale = appliquer_schema(jeux["globale"], SCHEMA_GLOBALE)
+    # Noms en double, noms sans demande
+    df_globale = pd.concat([df_globale, df_globale.iloc[:20]], ignore_index=True)
+    df_globale.loc[df_globale.index[-5:], "Name"] = [f"Inconnu {i}" for i in range(5)]
+    return df_mises, df_globale
+
+
+@pytest.mark.parametrize("predicats", [
+    {},
+    {"Statut d'incubation": ["Incubation individuelle"]},
+    {"CAR/SUM (territorial)": ["Inexistant"]},
+])
+def test_identique_a_isin_sur_les_filtres(donnees, predicats):
+    df_mises, df_globale = donnees
+    index = IndexDemandes.depuis(df_mises, df_globale)
+
+    _verifier(index, df_mises, df_globale, masque(df_globale, predicats))
+
+
+def test_selection_aleatoire(donnees):
+    df_mises, df_globale = donnees
+    index = IndexDemandes.depuis(df_mises, df_globale)
+    aleatoire = np.random.default_rng(0)
+
+    for _ in range(5):
+        _verifier(index, df_mises, df_globale, aleatoire.random(len(df_globale)) < 0.3)
+
+
+def test_cas_limites():
+    df_mises = pd.DataFrame({
+        "Utilisateur": ["a", "a", "b", "c", None, "d"],
+        COLONNE_STATUT: pd.Categorical(["Validée", None, "Refusée", "Validée", "Validée", "Refusée"]),
+    })
+    # "a" en double, "x" sans demande, un nom manquant, "d" absent de la base
+    df_globale = pd.DataFrame({"Name": ["a", "a", "b", "x", None, "c"]})
+    index = IndexDemandes.depuis(df_mises, df_globale)
+
+    for retenu in (
+        np.ones(6, dtype=bool),
+        np.zeros(6, dtype=bool),
+        np.array([True, True, False, False, False, False]),
+        np.array([False, False, False, True, False, False]),
+        np.array([False, False, False, False, True, False]),
+    ):
+        _verifier(index, df_mises, df_globale, retenu)
+
+    assert index.demandes(np.array([True, True, False, False, False, False])) == 2
+    assert index.statuts_demandes(np.zeros(6, dtype=bool)).empty
+
+
+def test_statut_non_categoriel():
+    df_mises = pd.DataFrame({"Utilisateur": ["a", "b", "b"], COLONNE_STATUT: ["Validée", "Refusée", "Refusée"]})
+    df_globale = pd.DataFrame({"Name": ["b"]})
+    index = IndexDemandes.depuis(df_mises, df_globale)
+
+    assert index.demandes(np.ones(1, dtype=bool)) == 2
+    assert index.statuts_demandes(np.ones(1, dtype=bool)).to_dict() == {"Refusée": 2}
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import memo
+from memo import Memo, taille_objet
+
+
+def test_lru_borne_en_entrees_et_octets_comptes():
+    memo = Memo("test", 2)
+    tableaux = {cle: np.zeros(1000) for cle in "abc"}
+    memo.put("a", tableaux["a"])
+    memo.put("b", tableaux["b"])
+    memo.get("a")
+    memo.put("c", tableaux["c"])
+
+    assert [cle for cle, _ in memo.items()] == ["a", "c"]
+    assert memo.octets == 2 * 8000
+    assert memo.stats()["evictions"] == 1
+    memo.pop("a")
+    assert memo.octets == 8000
+
+
+def test_taille_objet_compte_le_contenu():
+    df = pd.DataFrame({"x": np.arange(1000, dtype="int64"), "y": ["texte"] * 1000})
+    valeur = {"df": df, "tableau": np.zeros(500), "meme_df": df}
+
+    assert taille_objet(df) == df.memory_usage(index=True, deep=True).sum()
+    # Un objet référencé deux fois n'est compté qu'une fois
+    assert taille_objet(df) + 4000 < taille_objet(valeur) < taille_objet(df) + 4000 + 2000
+
+
+def test_obtenir_construit_une_seule_fois():
+    memo = Memo("test", 4)
+    constructions = []
+    depart = threading.Barrier(4)
+
+    def construire():
+        constructions.append(1)
+        return "valeur"
+
+    def session():
+        depart.wait()
+        assert memo.obtenir("cle", construire) == "valeur"
+
+    sessions = [threading.Thread(target=session) for _ in range(4)]
+    for t in sessions:
+        t.start()
+    for t in sessions:
+        t.join()
+
+    assert len(constructions) == 1
+
+
+def test_budget_commun_evince_le_moins_recemment_utilise(monkeypatch):
+    for existant in memo.memos():
+        existant.clear()
+    monkeypatch.setattr(memo, "BUDGET_OCTETS", 20_000)
+    premier, second = Memo("premier", 8), Memo("second", 8)
+    premier.put("a", np.zeros(1000))
+    second.put("b", np.zeros(1000))
+    premier.get("a")
+    # 24 000 octets : "b" est le moins récemment utilisé, tous mémos confondus
+    second.put("c", np.zeros(1000))
+
+    assert [cle for cle, _ in premier.items()] == ["a"]
+    assert [cle for cle, _ in second.items()] == ["c"]
+    assert memo.octets_total() == 16_000
+
+
+def test_valeur_plus_grosse_que_le_budget_non_gardee(monkeypatch):
+    monkeypatch.setattr(memo, "BUDGET_OCTETS", 1000)
+    hors_budget = Memo("hors-budget", 8)
+
+    assert hors_budget.obtenir("gros", lambda: np.zeros(1000)).nbytes == 8000
+    assert len(hors_budget) == 0
@@ -0,0 +1,27 @@
+import pytest
+
+import rapports
+
+
+def test_pdf_unicode_sans_remplacement():
+    if rapports.police_unicode() is None:
+        pytest.skip("aucune police TrueType Unicode installée")
+    pdf = rapports._RapportPDF()
+    pdf.add_page()
+    pdf.titre("L’œuvre")
+    pdf.ligne("Coût : 10 €")
+    contenu = bytes(pdf.output())
+
+    # Table ToUnicode des glyphes embarqués : ’, œ et € sont bien écrits
+    for code in (b"<2019>", b"<0153>", b"<20AC>"):
+        assert code in contenu
+
+
+def test_pdf_repli_latin1_sans_police(monkeypatch):
+    monkeypatch.setattr(rapports, "POLICES_PDF", [None])
+    pdf = rapports._RapportPDF()
+    pdf.add_page()
+    pdf.titre("L’œuvre à 10 €")
+
+    assert pdf.police == "helvetica"
+    assert bytes(pdf.output()).startswith(b"%PDF")
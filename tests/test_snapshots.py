@@ -0,0 +1,46 @@
+import os
+import time
+
+import pytest
+
+import snapshots
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def dossier(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(snapshots, "SNAPSHOT_FORMAT", "arrow")
+    return tmp_path
+
+
+def _vieillir(chemin, jours):
+    date = time.time() - jours * 86400
+    os.utime(chemin, (date, date))
+
+
+def test_snapshots_anciens_supprimes(dossier, jeux, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_MAX_JOURS", 30)
+    snapshots.sauver("ancien", jeux["users"])
+    snapshots.sauver("recent", jeux["users"])
+    _vieillir(snapshots.chemin_snapshot("ancien"), 31)
+    _vieillir(snapshots.chemin_snapshot("recent"), 5)
+
+    snapshots.sauver("nouveau", jeux["users"])
+
+    assert sorted(os.listdir(dossier)) == ["nouveau.arrow", "recent.arrow"]
+
+
+def test_budget_disque_moins_recemment_utilises_supprimes(dossier, jeux, monkeypatch):
+    for i, nom in enumerate(["a", "b", "c"]):
+        snapshots.sauver(nom, jeux["users"])
+        _vieillir(snapshots.chemin_snapshot(nom), 3 - i)
+    # Relu : redevient le plus récemment utilisé
+    assert snapshots.charger("a") is not None
+    taille = os.path.getsize(snapshots.chemin_snapshot("a"))
+    monkeypatch.setattr(snapshots, "SNAPSHOT_MAX_OCTETS", 2 * taille)
+
+    snapshots.sauver("d", jeux["users"])
+
+    assert sorted(os.listdir(dossier)) == ["a.arrow", "d.arrow"]
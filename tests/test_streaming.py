@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import ingestion
+import streaming
+from kpis import COLONNES_MARKETPLACE, AgregatsMarketplace, schema_kpis
+
+
+def _xlsx(df, lignes_vides=0):
+    # Données sur la première feuille, précédées de lignes vides ; une autre
+    # feuille est active à l'ouverture du classeur
+    classeur = Workbook()
+    historique = classeur.active
+    historique.title = "Historique"
+    for _ in range(lignes_vides):
+        historique.append([])
+    historique.append(list(df.columns))
+    for ligne in df.itertuples(index=False):
+        historique.append([None if pd.isna(v) else v for v in ligne])
+    classeur.create_sheet("Notes").append(["Export du jour"])
+    classeur.active = 1
+    tampon = io.BytesIO()
+    classeur.save(tampon)
+    return tampon.getvalue()
+
+
+def _comparable(agregats):
+    valeurs = agregats.vers_dict()
+    valeurs["mois"] = {mois: pytest.approx(cumul) for mois, cumul in valeurs["mois"].items()}
+    return {cle: pytest.approx(v) if isinstance(v, float) else v for cle, v in valeurs.items()}
+
+
+@pytest.mark.parametrize("lignes_vides", [0, 2])
+def test_blocs_xlsx_identiques_au_chargement_complet(jeux, lignes_vides):
+    content = _xlsx(jeux["mises"].iloc[:500], lignes_vides)
+    fichier = io.BytesIO(content)
+    fichier.name = "mises.xlsx"
+
+    df_complet = ingestion.charger_dataframe("mises.xlsx", content, COLONNES_MARKETPLACE, schema_kpis("mises"))
+    agregats = streaming.agreger_marketplace(fichier, taille_bloc=128)
+
+    assert agregats.nb_demandes == len(df_complet) == 500
+    assert agregats.vers_dict() == _comparable(AgregatsMarketplace.depuis(df_complet))
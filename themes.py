@@ -0,0 +1,117 @@
+import streamlit as st
+
+# --- Thèmes des scripts app*.py ---
+# CSS injecté en tête de page ; les vues elles-mêmes ne dépendent d'aucun thème.
+
+# Quest for Change (sobre & corporate), app5.py
+THEME_QUEST = """
+    <style>
+    .stApp {
+        background-color: #1d2732;
+        color: white;
+        font-family: "Helvetica Neue", Arial, sans-serif;
+    }
+    section[data-testid="stSidebar"] {
+        background-color: #253340;
+        color: white;
+    }
+    h1, h2, h3, h4 {
+        color: #3ecdd1;
+        font-weight: 600;
+    }
+    .stButton > button {
+        background-color: #3ecdd1;
+        color: #1d2732;
+        border: none;
+        border-radius: 6px;
+        font-weight: 600;
+        padding: 0.5em 1em;
+        transition: background-color 0.2s ease-in-out;
+    }
+    .stButton > button:hover {
+        background-color: #2ebdc1;
+        color: white;
+    }
+    .stFileUploader label {
+        color: #3ecdd1 !important;
+    }
+    .stDataFrame, .stTable {
+        background-color: #253340;
+        color: white;
+        border-radius: 8px;
+        border: none;
+    }
+    [data-testid="stMetric"] {
+        background-color: #253340;
+        border-radius: 8px;
+        padding: 1em;
+        margin-bottom: 10px;
+    }
+    [data-testid="stMetricLabel"] {
+        color: #3ecdd1 !important;
+    }
+    p, li { color: white; }
+    a { color: #3ecdd1; text-decoration: none; }
+    a:hover { text-decoration: underline; }
+    </style>
+"""
+
+# Thème global avec logos, app6.py
+THEME_LOGOS = """
+<style>
+.stApp {
+    background-color: #1d2732;
+    color: white;
+    font-family: 'Inter', sans-serif;
+}
+h1, h2, h3 {
+    color: #3ecdd1;
+    font-weight: 600;
+}
+section[data-testid="stSidebar"] {
+    background-color: #232f3c;
+    color: white;
+}
+.stButton > button {
+    background-color: #3ecdd1;
+    color: #1d2732;
+    border: none;
+    border-radius: 6px;
+    padding: 0.4em 1.2em;
+    font-weight: 600;
+    transition: all 0.2s ease;
+}
+.stButton > button:hover {
+    background-color: #35b9c1;
+    color: white;
+}
+.stMetric {
+    background-color: #232f3c;
+    border-radius: 8px;
+    padding: 0.8em;
+}
+.stMetric label {
+    color: #3ecdd1 !important;
+}
+.stTable {
+    background-color: #232f3c;
+    border-radius: 8px;
+    padding: 0.5em;
+}
+hr {
+    border: none;
+    border-top: 1px solid #3ecdd1;
+    margin: 1.5em 0;
+}
+</style>
+"""
+
+
+def appliquer_theme(css):
+    st.markdown(css, unsafe_allow_html=True)
+
+
+def logos():
+    st.sidebar.image("logo1.png", use_container_width=True)
+    st.sidebar.markdown("<br>", unsafe_allow_html=True)
+    st.sidebar.image("logo2.png", use_container_width=True)
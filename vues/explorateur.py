@@ -0,0 +1,106 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from connexions import connexions_memoise
+from cube import cube_memoise
+from grille import COLONNES_FILTRABLES, TAILLE_PAGE, masque, nb_pages, page, predicats_actifs
+from jointure import index_memoise
+from kpis import COLONNE_CONNEXION, empreinte_dataframe
+from socle import COLONNE_CONNEXION_GLOBALE, donnees_chargees
+
+# st_aggrid n'est importé qu'à l'ouverture de cette page ; s'il manque, seul
+# l'explorateur est indisponible
+try:
+    from st_aggrid import AgGrid, GridOptionsBuilder, DataReturnMode, GridUpdateMode
+except ImportError:
+    st.error("Le module streamlit-aggrid n'est pas installé : l'explorateur est indisponible.")
+    st.stop()
+
+donnees = donnees_chargees()
+df_users, df_mises, df_globale = donnees.users, donnees.mises, donnees.globale
+
+# --- Filtres (prédicats évalués côté serveur) ---
+st.subheader("Tableau interactif (filtrez les colonnes pour recalculer KPIs)")
+cube = cube_memoise(df_globale, empreinte_dataframe(df_globale))
+with st.expander("Filtres", expanded=True):
+    predicats = predicats_actifs({
+        col: st.multiselect(col, cube.compter(col).index.tolist(), key=f"filtre-{col}")
+        for col in COLONNES_FILTRABLES
+    })
+retenu = masque(df_globale, predicats)
+profils_total = int(retenu.sum())
+
+# --- Tableau interactif avec st_aggrid : seule la page visible est envoyée ---
+col_tri, col_ordre, col_page = st.columns(3)
+tri = col_tri.selectbox("Trier par", [None] + list(df_globale.columns))
+croissant = col_ordre.radio("Ordre", ["Croissant", "Décroissant"], horizontal=True) == "Croissant"
+numero = col_page.number_input(
+    f"Page (sur {nb_pages(profils_total)})", min_value=1, max_value=nb_pages(profils_total), value=1
+)
+df_page = page(df_globale, retenu, numero, tri=tri, croissant=croissant)
+
+gb = GridOptionsBuilder.from_dataframe(df_page)
+gb.configure_default_column(filterable=False, sortable=False)
+gridOptions = gb.build()
+
+AgGrid(
+    df_page,
+    gridOptions=gridOptions,
+    data_return_mode=DataReturnMode.AS_INPUT,
+    update_mode=GridUpdateMode.NO_UPDATE,
+    fit_columns_on_grid_load=True,
+    height=400,
+    reload_data=True
+)
+debut = (numero - 1) * TAILLE_PAGE
+st.caption(f"{profils_total} profils filtrés, lignes {debut + 1 if len(df_page) else 0} à {debut + len(df_page)}")
+
+# --- KPIs recalculés dynamiques (à partir des prédicats) ---
+st.subheader("KPIs dynamiques selon filtre")
+cube_filtre = cube.filtrer(**predicats)
+index_demandes = index_memoise(
+    df_mises, df_globale, (empreinte_dataframe(df_mises), empreinte_dataframe(df_globale))
+)
+demandes_total = index_demandes.demandes(retenu)
+connexions = connexions_memoise(df_users, empreinte_dataframe(df_users), COLONNE_CONNEXION)
+fenetre = st.radio("Fenêtre d'activité (jours)", [7, 30, 90], index=1, horizontal=True)
+profils_connectes = connexions.actifs_sur(fenetre)
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Profils filtrés", profils_total)
+col2.metric("Demandes Marketplace filtrées", demandes_total)
+col3.metric(f"Profils connectés ({fenetre} derniers jours)", profils_connectes)
+
+with st.expander("Activité des profils"):
+    connexions_globale = connexions_memoise(
+        df_globale, empreinte_dataframe(df_globale), COLONNE_CONNEXION_GLOBALE, "CAR/SUM (territorial)"
+    )
+    st.caption(f"Profils connectés sur les {fenetre} derniers jours, par CAR/SUM")
+    st.table(connexions_globale.actifs_par_groupe(debut=pd.Timestamp.today() - pd.Timedelta(days=fenetre)))
+    st.caption("Profils actifs depuis le début de chaque mois (dernière connexion)")
+    mensuels = connexions.actifs_mensuels()
+    mensuels.index = mensuels.index.astype(str)
+    st.line_chart(mensuels)
+
+# --- Graphiques dynamiques ---
+st.subheader("Statut profils personnels")
+persos_count = cube_filtre.compter("Profil personnel Le Club")
+if not persos_count.empty:
+    fig_persos = px.bar(persos_count.reset_index(), x="Profil personnel Le Club", y="count", text="count")
+    fig_persos.update_layout(xaxis_title="Profil personnel", yaxis_title="Nombre")
+    st.plotly_chart(fig_persos, use_container_width=True)
+
+st.subheader("Statut profils sociétés")
+societes_count = cube_filtre.compter("Profil sociétés Le Club")
+if not societes_count.empty:
+    fig_soc = px.bar(societes_count.reset_index(), x="Profil sociétés Le Club", y="count", text="count")
+    fig_soc.update_layout(xaxis_title="Profil sociétés", yaxis_title="Nombre")
+    st.plotly_chart(fig_soc, use_container_width=True)
+
+st.subheader("Marketplace (Demandes par statut)")
+if demandes_total:
+    status_counts = index_demandes.statuts_demandes(retenu)
+    fig_market = px.bar(status_counts.reset_index(), x="Statut des mises en relation à date", y="count", text="count")
+    fig_market.update_layout(xaxis_title="Statut", yaxis_title="Nombre de demandes")
+    st.plotly_chart(fig_market, use_container_width=True)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import streamlit as st
+
+from exports import bouton_telechargement
+# python-docx et fpdf2 ne sont importés (via rapports) qu'à l'ouverture de cette page
+from rapports import generate_docx_final, generate_docx_metrics, generate_pdf_metrics
+from socle import donnees_chargees
+
+# --- Extracts DOCX / PDF, générés à la demande ---
+# Variables passées par socle.vues() pour les scripts app*.py :
+#   extracts : extracts proposés, parmi EXTRACTS (défaut : DOCX et PDF) ;
+#   entete   : titre et date de calcul au-dessus des boutons (défaut : oui)
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EXTRACTS = {
+    "docx": (generate_docx_metrics, "Télécharger l'extract en DOCX", "dashboard_extract_{date}.docx", MIME_DOCX),
+    "pdf": (generate_pdf_metrics, "Télécharger l'extract en PDF", "dashboard_extract_{date}.pdf", "application/pdf"),
+    "final": (generate_docx_final, "Télécharger l'extract final en DOCX", "dashboard_extract_{date}.docx", MIME_DOCX),
+}
+
+donnees = donnees_chargees()
+resultats = donnees.resultats()
+cle = donnees.cle()
+
+if globals().get("entete", True):
+    st.header("Extracts")
+    st.caption(f"KPIs calculés le {resultats.date_calcul.strftime('%d/%m/%Y à %H:%M')}")
+for nom in globals().get("extracts", ("docx", "pdf")):
+    generateur, label, file_name, mime = EXTRACTS[nom]
+    bouton_telechargement(
+        cle, generateur, resultats,
+        label=label,
+        file_name=file_name.format(date=datetime.today().strftime('%Y%m%d')),
+        mime=mime
+    )
@@ -0,0 +1,55 @@
+import streamlit as st
+
+# Plotly Express n'est importé (via graphiques) qu'à l'ouverture de cette page
+from graphiques import afficher, figures_memoisees
+from socle import donnees_chargees
+
+donnees = donnees_chargees()
+resultats, figures = figures_memoisees(
+    donnees.users, donnees.entreprises, donnees.mises, donnees.globale, marketplace=donnees.marketplace
+)
+
+# --- KPIs globaux ---
+st.header("KPIs Globaux")
+kpi1, kpi2, kpi3 = st.columns(3)
+kpi1.metric("Demandes de mise en relation", resultats.demandes_total)
+kpi2.metric("Profils créés", resultats.profils_total)
+kpi3.metric("Profils connectés sur le mois", resultats.profils_connectes)
+
+# --- Marketplace ---
+st.header("Marketplace")
+
+# Statut mises en relation
+if "statut" in figures:
+    afficher(figures, "statut")
+
+# Répartition par période (rollups mois / trimestre / année)
+granularite = st.radio(
+    "Granularité", ["M", "Q", "Y"], index=1, horizontal=True,
+    format_func={"M": "Mois", "Q": "Trimestre", "Y": "Année"}.get
+)
+if f"periodes_{granularite}" in figures:
+    afficher(figures, f"periodes_{granularite}")
+
+# Taux de conversion
+afficher(figures, "taux")
+
+# --- Profils persos & Sociétés ---
+st.header("Profils persos & Sociétés")
+afficher(figures, "users_statut")
+afficher(figures, "entreprises_statut")
+
+# --- Complétion des profils ---
+st.header("Complétion des profils (Base Globale)")
+
+# Profils personnels
+if "complet_persos" in figures:
+    afficher(figures, "complet_persos")
+else:
+    st.info("Aucun profil personnel à afficher.")
+
+# Profils sociétés
+if "complet_societes" in figures:
+    afficher(figures, "complet_societes")
+else:
+    st.info("Aucun profil société à afficher.")
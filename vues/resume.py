@@ -0,0 +1,36 @@
+import streamlit as st
+
+from socle import donnees_chargees
+
+# --- Résumé (app6.py) : métriques, totaux trimestriels et répartitions globales ---
+resultats = donnees_chargees().resultats()
+
+# --- Datas globales ---
+st.header("Datas globales")
+st.metric("Demandes de mise en relation", resultats.demandes_total)
+st.metric("Profils créés", resultats.profils_total)
+st.metric("Profils connectés sur le mois", resultats.profils_connectes)
+
+# --- Marketplace ---
+st.header("Marketplace")
+st.metric("Go Between validés", resultats.go_between_valides)
+st.metric("RDV réalisés", resultats.rdv_realises)
+st.metric("RDV non réalisés", resultats.rdv_non_realises)
+st.metric("Taux de conversion Go Between (%)", resultats.taux_go_between)
+st.metric("Taux de conversion RDV réalisés (%)", resultats.taux_rdv)
+
+# Totaux trimestriels
+st.header("Totaux trimestriels")
+st.table(resultats.trimestriel)
+
+# --- Profils persos & Sociétés ---
+st.header("Profils persos & Sociétés")
+st.metric("Nombre total d'entrepreneurs", resultats.nb_entrepreneurs)
+st.metric("Total profils persos", resultats.profils_total)
+st.table(resultats.statut_users)
+st.table(resultats.statut_entreprises)
+
+# --- Complétion des profils ---
+st.header("Complétion des profils")
+st.table(resultats.profil_personnel)
+st.table(resultats.profil_societes)
@@ -0,0 +1,54 @@
+import streamlit as st
+
+from socle import donnees_chargees
+
+# --- Synthèse : métriques et tableaux, sans dépendance lourde ---
+resultats = donnees_chargees().resultats()
+
+# --- Datas globales ---
+st.header("Datas globales")
+st.metric("Demandes de mise en relation", resultats.demandes_total)
+st.metric("Profils créés", resultats.profils_total)
+st.metric("Profils connectés sur le mois", resultats.profils_connectes)
+
+# --- Marketplace ---
+st.header("Marketplace")
+st.subheader("Totaux")
+st.metric("Go Between validés", resultats.go_between_valides)
+st.metric("RDV réalisés", resultats.rdv_realises)
+st.metric("RDV non réalisés", resultats.rdv_non_realises)
+
+st.subheader("Statut des mises en relation")
+st.table(resultats.statuts_mises)
+
+st.metric("Taux de conversion Go Between (%)", resultats.taux_go_between)
+st.metric("Taux de conversion RDV réalisés (%)", resultats.taux_rdv)
+
+st.subheader("Répartition trimestrielle des demandes")
+st.table(resultats.trimestriel)
+
+# --- Profils persos & Sociétés ---
+st.header("Profils persos & Sociétés")
+st.metric("Nombre total d'entrepreneurs", resultats.nb_entrepreneurs)
+st.metric("Total profils persos", resultats.profils_total)
+
+st.subheader("Statut profils persos")
+st.table(resultats.statut_users)
+
+st.subheader("Statut profils sociétés")
+st.table(resultats.statut_entreprises)
+
+# --- Complétion des profils (Base Globale) ---
+st.header("Complétion des profils")
+st.subheader("Vue globale")
+st.table(resultats.profil_personnel)
+st.table(resultats.profil_societes)
+
+st.subheader("Par CAR/SUM")
+st.table(resultats.par_car_sum)
+
+st.subheader("Par Incubateur territorial")
+st.table(resultats.par_incubateur)
+
+st.subheader("% de complétion sur les profils incubation individuelle")
+st.table(resultats.completion_incubation_indiv)